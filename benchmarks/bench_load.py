@@ -0,0 +1,92 @@
+"""Сравнение времени загрузки хранилища: полная гидратация против ленивой.
+
+Запуск из корня проекта: python -m benchmarks.bench_load [количество_задач]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.generator import generate_records
+from core.models import Task, LazyTask, Priority, TaskStatus
+from repository.serializers import SERIALIZERS, get_serializer
+from repository.task_repository import TaskRepository
+
+
+def eager_dict_to_task(data: dict) -> Task:
+    """Прежняя полная гидратация: все даты и перечисления сразу"""
+    return Task(
+        id=data['id'],
+        title=data['title'],
+        description=data['description'],
+        priority=Priority(data['priority']),
+        status=TaskStatus(data['status']),
+        due_date=datetime.fromisoformat(data['due_date']),
+        created_date=datetime.fromisoformat(data['created_date']),
+        completed_date=datetime.fromisoformat(data['completed_date']) if data['completed_date'] else None,
+        reminder_time=datetime.fromisoformat(data['reminder_time']) if data['reminder_time'] else None
+    )
+
+
+def measure(func, repeat: int = 3) -> float:
+    """Возвращает лучшее время выполнения в миллисекундах"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(count: int):
+    storage_file = os.path.join(tempfile.mkdtemp(), "tasks.json")
+    with open(storage_file, 'w', encoding='utf-8') as f:
+        json.dump(generate_records(count), f, indent=2, ensure_ascii=False)
+    with open(storage_file, 'rb') as f:
+        payload = f.read()
+    records = json.loads(payload)
+
+    def eager_load():
+        with open(storage_file, 'r', encoding='utf-8') as f:
+            return [eager_dict_to_task(data) for data in json.load(f)]
+
+    def repository_load(serializer_name):
+        def load():
+            repository = TaskRepository(storage_file)
+            repository._serializer = get_serializer(serializer_name)
+            return repository._get_cache()
+        return load
+
+    print(f"Задач: {count}")
+    sections = [
+        ("Разбор файла", [
+            ("json", lambda: get_serializer("json").loads(payload)),
+        ]),
+        ("Гидратация записей", [
+            ("полная (прежний _dict_to_task)", lambda: [eager_dict_to_task(data) for data in records]),
+            ("ленивая (LazyTask)", lambda: [LazyTask(data) for data in records]),
+        ]),
+        ("Открытие хранилища целиком", [
+            ("прежний путь: json + полная гидратация", eager_load),
+            ("TaskRepository: json + ленивые задачи", repository_load("json")),
+        ]),
+    ]
+    if "orjson" in SERIALIZERS:
+        sections[0][1].append(("orjson", lambda: get_serializer("orjson").loads(payload)))
+        sections[2][1].append(("TaskRepository: orjson + ленивые задачи", repository_load("orjson")))
+    else:
+        print("orjson не установлен - варианты с ним пропущены")
+
+    for title, variants in sections:
+        print(title)
+        baseline = None
+        for name, func in variants:
+            elapsed = measure(func)
+            baseline = baseline or elapsed
+            print(f"  {name:44} {elapsed:9.1f} мс  x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,68 @@
+"""Генератор синтетических задач для бенчмарков."""
+import json
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from core.models import Priority, TaskStatus
+
+# Стандартные размеры хранилища для бенчмарков
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+PRIORITY_WEIGHTS = ((Priority.LOW, 0.3), (Priority.MEDIUM, 0.5), (Priority.HIGH, 0.2))
+
+
+def generate_records(count: int, seed: int = 42, today: Optional[datetime] = None) -> List[dict]:
+    """Создает записи задач в формате tasks.json с реалистичным разбросом дат.
+
+    Сроки распределены нормально вокруг сегодняшнего дня (σ = 60 дней) в рабочие часы.
+    Прошлые задачи в основном выполнены, будущие - в основном ожидают.
+    """
+    rnd = random.Random(seed)
+    today = today or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    priorities = [priority.value for priority, _ in PRIORITY_WEIGHTS]
+    weights = [weight for _, weight in PRIORITY_WEIGHTS]
+
+    records = []
+    for i in range(count):
+        due_date = today + timedelta(days=int(rnd.gauss(0, 60)),
+                                     hours=rnd.randint(8, 20),
+                                     minutes=rnd.randrange(0, 60, 5))
+        created_date = due_date - timedelta(days=rnd.randint(0, 14), hours=rnd.randint(0, 23))
+
+        roll = rnd.random()
+        if due_date < today:
+            status = (TaskStatus.COMPLETED if roll < 0.8 else
+                      TaskStatus.CANCELLED if roll < 0.85 else TaskStatus.PENDING)
+        else:
+            status = (TaskStatus.PENDING if roll < 0.8 else
+                      TaskStatus.IN_PROGRESS if roll < 0.95 else TaskStatus.COMPLETED)
+
+        completed_date = None
+        if status == TaskStatus.COMPLETED:
+            # Выполняют чаще до срока, иногда с опозданием
+            completed_date = created_date + (due_date - created_date) * rnd.random()
+            if rnd.random() < 0.2:
+                completed_date = due_date + timedelta(hours=rnd.expovariate(1 / 12))
+
+        reminder_time = due_date - timedelta(minutes=30) if rnd.random() < 0.3 else None
+
+        records.append({
+            'id': str(uuid.UUID(int=rnd.getrandbits(128), version=4)),
+            'title': f"Задача {i}",
+            'description': "Описание задачи" if rnd.random() < 0.4 else "",
+            'priority': rnd.choices(priorities, weights)[0],
+            'status': status.value,
+            'due_date': due_date.isoformat(),
+            'created_date': created_date.isoformat(),
+            'completed_date': completed_date.isoformat() if completed_date else None,
+            'reminder_time': reminder_time.isoformat() if reminder_time else None,
+        })
+    return records
+
+
+def write_tasks_file(path: str, records: List[dict]):
+    """Записывает задачи в файл формата tasks.json"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,105 @@
+"""Запуск набора бенчмарков и сравнение результатов двух прогонов.
+
+Примеры (из корня проекта):
+    python -m benchmarks.run --sizes 1000,10000 --output before.json
+    python -m benchmarks.run --sizes 1000,10000 --output after.json --compare before.json
+    python -m benchmarks.run --compare-only before.json after.json --threshold 0.1
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+from datetime import datetime
+
+from benchmarks.generator import SIZES
+from benchmarks.suite import run_cases
+
+BACKENDS = ("json", "journal", "sqlite")
+DEFAULT_THRESHOLD = 0.2  # Регрессия: медиана выросла больше чем на 20%
+
+
+def run_suite(sizes, backends) -> dict:
+    """Прогоняет все измерения и возвращает результаты в виде словаря"""
+    results = {}
+    for backend in backends:
+        for size in sizes:
+            print(f"{backend}: {size} задач...", flush=True)
+            with tempfile.TemporaryDirectory() as directory:
+                for case, stats in run_cases(backend, size, directory).items():
+                    results[f"{backend}/{size}/{case}"] = stats
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': list(sizes),
+            'backends': list(backends),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Печатает сравнение медиан и возвращает список регрессий"""
+    regressions = []
+    old_results, new_results = baseline['results'], current['results']
+    for key in sorted(old_results.keys() & new_results.keys()):
+        old, new = old_results[key]['median_ms'], new_results[key]['median_ms']
+        ratio = new / old if old else float('inf')
+        marker = ""
+        if ratio > 1 + threshold:
+            marker = "  <-- регрессия"
+            regressions.append((key, old, new, ratio))
+        print(f"{key:60} {old:10.3f} -> {new:10.3f} мс  x{ratio:5.2f}{marker}")
+    return regressions
+
+
+def print_results(report: dict):
+    for key, stats in report['results'].items():
+        print(f"{key:60} медиана {stats['median_ms']:10.3f} мс  мин {stats['min_ms']:10.3f} мс")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки Smart Planner")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="размеры хранилища через запятую")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help="хранилища через запятую: json, journal, sqlite")
+    parser.add_argument("--output", help="куда записать результаты в JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="сравнить с прошлым прогоном")
+    parser.add_argument("--compare-only", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="только сравнить два файла результатов")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимый рост медианы, доля (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    if args.compare_only:
+        with open(args.compare_only[0], encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.compare_only[1], encoding='utf-8') as f:
+            current = json.load(f)
+        return 1 if compare(baseline, current, args.threshold) else 0
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    backends = [backend.strip() for backend in args.backends.split(",")]
+    report = run_suite(sizes, backends)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Результаты сохранены в {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        print(f"Регрессий: {len(regressions)}")
+        return 1 if regressions else 0
+
+    print_results(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
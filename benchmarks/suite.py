@@ -0,0 +1,215 @@
+"""Набор измерений для репозитория, сервиса и подготовки данных экранов."""
+import os
+import random
+import statistics
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from benchmarks.generator import generate_records, write_tasks_file
+from core.models import Priority
+from utils.date_utils import month_bounds
+
+
+def repeat_for(size: int) -> int:
+    """Сколько раз повторять измерение для хранилища такого размера"""
+    if size <= 10_000:
+        return 20
+    if size <= 100_000:
+        return 5
+    return 2
+
+
+def measure(func: Callable, repeat: int, setup: Callable = None) -> Dict[str, float]:
+    """Выполняет func repeat раз и возвращает статистику в миллисекундах"""
+    timings = []
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for _ in range(repeat):
+            argument = setup() if setup else None
+            start = time.perf_counter()
+            func(argument) if setup else func()
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'median_ms': statistics.median(timings),
+        'min_ms': min(timings),
+        'max_ms': max(timings),
+        'runs': repeat,
+    }
+
+
+def create_repository(backend: str, directory: str, records: List[dict]):
+    """Создает репозиторий выбранного типа с заранее записанными задачами"""
+    json_file = os.path.join(directory, "tasks.json")
+    write_tasks_file(json_file, records)
+
+    if backend == "json":
+        from repository.task_repository import TaskRepository
+        return TaskRepository(json_file)
+    if backend == "journal":
+        from repository.journal_task_repository import JournalTaskRepository
+        return JournalTaskRepository(json_file)
+    if backend == "sqlite":
+        from repository.sqlite_task_repository import SqliteTaskRepository
+        return SqliteTaskRepository(os.path.join(directory, "tasks.db"), import_file=json_file)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+class StubNotificationService:
+    """Заглушка уведомлений: бенчмарк не должен запускать таймеры и системные уведомления"""
+
+    def schedule_reminder(self, task):
+        pass
+
+    def cancel_reminder(self, task_id):
+        pass
+
+    def schedule_reminders(self, tasks):
+        pass
+
+    def cancel_reminders(self, task_ids):
+        pass
+
+
+def calendar_month_data(task_service, year: int, month: int):
+    """Путь данных CalendarScreen: задачи месяца одним запросом, разложенные по дням"""
+    start, end = month_bounds(year, month)
+    month_tasks = {}
+    for task in task_service.get_tasks_in_range(start, end):
+        month_tasks.setdefault(task.due_date.day, []).append(task)
+    return {day: len(tasks) for day, tasks in month_tasks.items()}, month_tasks
+
+
+def statistics_data(analytics_service):
+    """Путь данных StatisticsScreen: количество выполненных и процент продуктивности"""
+    summary = analytics_service.get_summary()
+    return summary['completed_tasks'], summary['productivity_percent']
+
+
+def run_cases(backend: str, size: int, directory: str, seed: int = 42) -> Dict[str, dict]:
+    """Измеряет все методы репозитория и сервиса для одного хранилища"""
+    from services.task_service import TaskService
+    from services.analytics_service import AnalyticsService
+    from services.calendar_service import CalendarService
+    from repository.statistics_repository import StatisticsRepository
+
+    records = generate_records(size, seed=seed)
+    rnd = random.Random(seed)
+    repeat = repeat_for(size)
+    results = {}
+
+    # Первое открытие измеряется один раз: для SQLite сюда входит импорт из JSON
+    start = time.perf_counter()
+    repository = create_repository(backend, directory, records)
+    repository.get_task(records[0]['id']) if records else repository.get_all_tasks()
+    elapsed = (time.perf_counter() - start) * 1000
+    results['repository.open'] = {'median_ms': elapsed, 'min_ms': elapsed, 'max_ms': elapsed, 'runs': 1}
+
+    # Заглушка подходит и вместо ReminderService: интерфейс планирования тот же
+    notifications = StubNotificationService()
+    service = TaskService(task_repository=repository, notification_service=notifications,
+                          reminder_service=notifications)
+    # Статистика поддерживается по событиям сервиса, как в приложении
+    analytics = AnalyticsService(
+        service, StatisticsRepository(os.path.join(directory, "statistics.json")))
+    analytics.rebuild()
+    calendar = CalendarService(service)
+    ids = [record['id'] for record in records]
+    today = datetime.now()
+    sample_day = datetime.fromisoformat(rnd.choice(records)['due_date'])
+
+    def random_task(_=None):
+        return repository.get_task(rnd.choice(ids))
+
+    def new_task_kwargs():
+        return dict(title="Новая задача", description="", priority=Priority.MEDIUM,
+                    due_date=today + timedelta(days=rnd.randint(-30, 30)))
+
+    def update_and_flush(task):
+        task.title = task.title + "!"
+        repository.update_task(task)
+        repository.flush()
+
+    def add_and_flush(_):
+        service.create_task(**new_task_kwargs())
+        repository.flush()
+
+    def pop_random_task():
+        task_id = ids.pop(rnd.randrange(len(ids)))
+        return repository.get_task(task_id)
+
+    def delete_and_flush(task):
+        repository.delete_task(task.id)
+        repository.flush()
+
+    # Маленькие хранилища могут содержать меньше задач, чем размер пачки
+    def sample_ids(count):
+        return rnd.sample(ids, min(count, len(ids)))
+
+    def pop_random_ids(count):
+        return [ids.pop(rnd.randrange(len(ids))) for _ in range(min(count, len(ids)))]
+
+    month_start, month_end = month_bounds(today.year, today.month)
+    cases = {
+        # Репозиторий
+        'repository.get_task': (lambda: repository.get_task(rnd.choice(ids)), None),
+        'repository.get_all_tasks': (repository.get_all_tasks, None),
+        'repository.get_tasks_by_date': (lambda: repository.get_tasks_by_date(sample_day), None),
+        'repository.get_tasks_in_range': (
+            lambda: repository.get_tasks_in_range(month_start, month_end), None),
+        'repository.count_tasks_by_day': (
+            lambda: repository.count_tasks_by_day(month_start, month_end), None),
+        'repository.get_completed_tasks': (repository.get_completed_tasks, None),
+        'repository.get_pending_tasks': (repository.get_pending_tasks, None),
+        'repository.get_tasks_by_priority': (
+            lambda: repository.get_tasks_by_priority(Priority.HIGH), None),
+        'repository.update_task+flush': (update_and_flush, random_task),
+        'repository.delete_task+flush': (delete_and_flush, pop_random_task),
+        # Сервис
+        'service.create_task+flush': (add_and_flush, lambda: None),
+        'service.get_all_tasks': (service.get_all_tasks, None),
+        'service.get_today_tasks': (service.get_today_tasks, None),
+        'service.get_tasks_by_date': (lambda: service.get_tasks_by_date(sample_day), None),
+        'service.get_tasks_in_range': (
+            lambda: service.get_tasks_in_range(month_start, month_end), None),
+        'service.get_task_counts_by_day': (
+            lambda: service.get_task_counts_by_day(today.year, today.month), None),
+        'service.complete_task+flush': (
+            lambda task: (service.complete_task(task.id), repository.flush()), random_task),
+        'service.update_task+flush': (
+            lambda task: (service.update_task(task.id, title="Изменено"), repository.flush()),
+            random_task),
+        'service.complete_tasks(50)+flush': (
+            lambda task_ids: (service.complete_tasks(task_ids), repository.flush()),
+            lambda: sample_ids(50)),
+        'service.update_tasks(50)+flush': (
+            lambda task_ids: (service.update_tasks({task_id: {'title': "Изменено"}
+                                                    for task_id in task_ids}),
+                              repository.flush()),
+            lambda: sample_ids(50)),
+        'service.delete_tasks(50)+flush': (
+            lambda task_ids: (service.delete_tasks(task_ids), repository.flush()),
+            lambda: pop_random_ids(50)),
+        'service.create_tasks(50)+flush': (
+            lambda _: (service.create_tasks([new_task_kwargs() for _ in range(50)]),
+                       repository.flush()),
+            lambda: None),
+        # Подготовка данных экранов
+        'view.calendar_month': (lambda: calendar_month_data(service, today.year, today.month), None),
+        'view.calendar_month(cached)': (lambda: calendar.get_month(today.year, today.month), None),
+        'view.statistics': (lambda: statistics_data(analytics), None),
+        'analytics.rebuild': (analytics.rebuild, None),
+        'analytics.completion_percentiles': (
+            lambda: analytics.get_completion_percentiles(Priority.HIGH), None),
+        'analytics.productivity_series(30)': (
+            lambda: analytics.get_productivity_series(30), None),
+    }
+
+    for name, (func, setup) in cases.items():
+        results[name] = measure(func, repeat, setup)
+
+    repository.flush()
+    analytics.flush()
+    if hasattr(repository, 'close'):
+        repository.close()
+    return results
@@ -0,0 +1,65 @@
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, List, Optional
+from core.models import Task
+from utils.metrics import get_logger
+
+logger = get_logger(__name__)
+
+
+class ChangeType(Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    COMPLETED = "completed"
+    DELETED = "deleted"
+
+
+@dataclass(slots=True, frozen=True)
+class TaskChangeEvent:
+    """Изменение задачи: task - состояние после изменения (для удаления - удаленная задача),
+    previous - состояние до него (для обновления и выполнения)"""
+    type: ChangeType
+    task: Task
+    previous: Optional[Task] = None
+
+    def affected_dates(self):
+        """Даты сроков, которых касается изменение (старая и новая при переносе)"""
+        dates = {self.task.due_date.date()}
+        if self.previous is not None:
+            dates.add(self.previous.due_date.date())
+        return dates
+
+
+class TaskEventBus:
+    """Рассылает события изменения задач подписчикам.
+
+    Подписчик получает список событий одной операции (массовые методы сервиса
+    публикуют их одной пачкой). Вызов идет в потоке, который изменил данные, поэтому
+    экраны сами переносят обработку в главный поток. Ошибка подписчика только
+    логируется: данные уже записаны, а остальные подписчики должны получить события.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Callable[[List[TaskChangeEvent]], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[List[TaskChangeEvent]], None]) -> Callable[[], None]:
+        """Подписывает callback на события; возвращает функцию отписки"""
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers = [s for s in self._subscribers if s is not callback]
+        return unsubscribe
+
+    def publish(self, events: List[TaskChangeEvent]):
+        """Передает события всем подписчикам"""
+        if not events:
+            return
+        for callback in self._subscribers:
+            try:
+                callback(events)
+            except Exception:
+                logger.exception("Ошибка подписчика событий задач %r", callback)
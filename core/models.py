@@ -17,7 +17,21 @@ class TaskStatus(Enum):
     CANCELLED = "Отменена"
 
 
-@dataclass
+# Канонические члены перечислений по значению: поиск в словаре дешевле вызова Enum(...)
+_PRIORITY_BY_VALUE = {priority.value: priority for priority in Priority}
+_STATUS_BY_VALUE = {status.value: status for status in TaskStatus}
+
+
+def _parse_priority(value) -> Priority:
+    # Неизвестное значение - ValueError от Enum, как при обычном разборе
+    return _PRIORITY_BY_VALUE.get(value) or Priority(value)
+
+
+def _parse_status(value) -> TaskStatus:
+    return _STATUS_BY_VALUE.get(value) or TaskStatus(value)
+
+
+@dataclass(slots=True)
 class Task:
     id: str
     title: str
@@ -31,12 +45,83 @@ class Task:
 
     def __post_init__(self):
         if isinstance(self.priority, str):
-            self.priority = Priority(self.priority)
+            self.priority = _parse_priority(self.priority)
         if isinstance(self.status, str):
-            self.status = TaskStatus(self.status)
+            self.status = _parse_status(self.status)
 
+    def __eq__(self, other):
+        # Сравниваются поля, а не классы: хранилище возвращает ленивые задачи (LazyTask)
+        if not isinstance(other, Task):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in TASK_FIELDS)
 
-@dataclass
+
+TASK_FIELDS = tuple(Task.__slots__)
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class LazyTask(Task):
+    """Задача из сырого словаря хранилища: даты и перечисления разбираются при первом обращении"""
+
+    __slots__ = ('_raw',)
+
+    _PARSERS = {
+        'priority': _parse_priority,
+        'status': _parse_status,
+        'due_date': _parse_datetime,
+        'created_date': _parse_datetime,
+        'completed_date': _parse_datetime,
+        'reminder_time': _parse_datetime,
+    }
+
+    def __init__(self, data: dict):
+        # Строковые поля дешевые - заполняем сразу, остальные слоты остаются пустыми
+        set_field = object.__setattr__
+        set_field(self, '_raw', data)
+        set_field(self, 'id', data['id'])
+        set_field(self, 'title', data['title'])
+        set_field(self, 'description', data['description'])
+
+    def __getattr__(self, name):
+        # Вызывается только для еще не заполненных слотов
+        parser = self._PARSERS.get(name)
+        raw = self.raw
+        if parser is None or raw is None:
+            raise AttributeError(name)
+        value = parser(raw[name])
+        object.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        # После изменения сырой словарь устаревает: дочитываем поля и забываем его
+        if self.raw is not None:
+            for field_name in self._PARSERS:
+                getattr(self, field_name)
+            object.__setattr__(self, '_raw', None)
+        object.__setattr__(self, name, value)
+
+    def __copy__(self):
+        if self.raw is not None:
+            return LazyTask(self.raw)
+        clone = LazyTask.__new__(LazyTask)
+        object.__setattr__(clone, '_raw', None)
+        for name in TASK_FIELDS:
+            object.__setattr__(clone, name, getattr(self, name))
+        return clone
+
+    @property
+    def raw(self) -> Optional[dict]:
+        """Исходный словарь хранилища, если задача с тех пор не менялась"""
+        try:
+            return object.__getattribute__(self, '_raw')
+        except AttributeError:
+            return None
+
+
+@dataclass(slots=True)
 class Reminder:
     id: str
     task_id: str
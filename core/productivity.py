@@ -0,0 +1,112 @@
+"""Векторизованные ряды продуктивности по колонкам TaskTable (NumPy)."""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional
+from core.models import TaskStatus
+from core.task_table import TaskTable, STATUS_CODES, NO_DATE, EPOCH
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+_MICROSECONDS_PER_DAY = 86_400 * 1_000_000
+_COMPLETED_CODE = STATUS_CODES.index(TaskStatus.COMPLETED)
+_EPOCH_DATE = EPOCH.date()
+
+
+@dataclass
+class ProductivitySeries:
+    """Ряды по дням start .. start + len - 1 и серии дней с выполненными задачами"""
+    start: date
+    due: "np.ndarray"  # задач со сроком в этот день
+    completed: "np.ndarray"  # задач выполнено в этот день
+    completion_rate: "np.ndarray"  # доля выполненных среди задач со сроком в этот день, %
+    rolling_7: "np.ndarray"  # среднее выполненных за 7 дней
+    rolling_30: "np.ndarray"  # среднее выполненных за 30 дней
+    current_streak: int
+    longest_streak: int
+
+    def to_chart_data(self) -> List[tuple]:
+        """Точки графика: (дата, срок, выполнено, процент, среднее 7, среднее 30)"""
+        return [
+            (self.start + timedelta(days=offset), int(due), int(completed),
+             round(float(rate), 1), round(float(avg7), 2), round(float(avg30), 2))
+            for offset, (due, completed, rate, avg7, avg30) in enumerate(zip(
+                self.due, self.completed, self.completion_rate, self.rolling_7, self.rolling_30))
+        ]
+
+
+def _rolling_mean(values, window: int):
+    """Скользящее среднее через кумулятивную сумму (в начале ряда - по доступным дням)"""
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    index = np.arange(1, len(values) + 1)
+    lower = np.maximum(index - window, 0)
+    return (cumulative[index] - cumulative[lower]) / (index - lower)
+
+
+def _streaks(active) -> tuple:
+    """Текущая (до последнего дня) и самая длинная серия подряд идущих активных дней"""
+    if not active.any():
+        return 0, 0
+    padded = np.concatenate(([0], active.astype(np.int8), [0]))
+    changes = np.diff(padded)
+    starts = np.flatnonzero(changes == 1)
+    ends = np.flatnonzero(changes == -1)
+    longest = int((ends - starts).max())
+    # Серия не прерывается, если сегодня еще ничего не выполнено
+    last = len(active) - 1 if active[-1] or len(active) < 2 else len(active) - 2
+    current = int(last - starts[-1] + 1) if ends[-1] > last >= starts[-1] else 0
+    return current, longest
+
+
+def productivity_series(table: TaskTable, end: date, days: int = 30) -> Optional[ProductivitySeries]:
+    """Считает ряды за days дней, заканчивая днем end; None, если NumPy не установлен.
+
+    Средние и серии считаются по всей истории, поэтому начало окна и рекорд
+    не зависят от его длины.
+    """
+    if np is None:
+        return None
+
+    due_us = np.frombuffer(table.due_dates, dtype=np.int64)
+    completed_us = np.frombuffer(table.completed_dates, dtype=np.int64)
+    is_completed = np.frombuffer(table.status_codes, dtype=np.uint8) == _COMPLETED_CODE
+
+    end_day = (end - _EPOCH_DATE).days
+    due_days = due_us // _MICROSECONDS_PER_DAY
+    completed_mask = is_completed & (completed_us != NO_DATE)
+    completed_days = completed_us[completed_mask] // _MICROSECONDS_PER_DAY
+
+    # История начинается с самого раннего срока или выполнения, но не позже окна
+    first_day = end_day - days + 1
+    if len(due_days):
+        first_day = min(first_day, int(due_days.min()))
+    if len(completed_days):
+        first_day = min(first_day, int(completed_days.min()))
+    length = end_day - first_day + 1
+
+    due_in_range = (due_days >= first_day) & (due_days <= end_day)
+    due_index = due_days[due_in_range] - first_day
+    due = np.bincount(due_index, minlength=length)
+    due_completed = np.bincount(due_index, weights=is_completed[due_in_range], minlength=length)
+
+    completed_index = completed_days[(completed_days >= first_day) & (completed_days <= end_day)]
+    completed = np.bincount(completed_index - first_day, minlength=length)
+
+    rate = np.divide(due_completed * 100.0, due, out=np.zeros(length), where=due > 0)
+    current_streak, longest_streak = _streaks(completed > 0)
+
+    window = slice(length - days, length)
+    return ProductivitySeries(
+        start=end - timedelta(days=days - 1),
+        due=due[window],
+        completed=completed[window],
+        completion_rate=rate[window],
+        rolling_7=_rolling_mean(completed, 7)[window],
+        rolling_30=_rolling_mean(completed, 30)[window],
+        current_streak=current_streak,
+        longest_streak=longest_streak,
+    )
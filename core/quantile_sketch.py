@@ -0,0 +1,135 @@
+import math
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+
+class QuantileSketch:
+    """Потоковый скетч квантилей в стиле DDSketch.
+
+    Значение попадает в логарифмическую корзину ceil(log_gamma(|x|)), поэтому оценка
+    любого квантиля отличается от точного значения не больше чем на relative_accuracy.
+    Корзин столько, сколько порядков между наименьшим и наибольшим значением
+    (около 1500 от секунды до 10 лет в часах при точности 1%), и их число не растет
+    с количеством значений. Скетчи с одинаковой точностью складываются (merge),
+    а значения можно вычитать (remove), если задача перестала быть выполненной.
+    """
+
+    __slots__ = ('relative_accuracy', 'min_value', '_gamma', '_log_gamma',
+                 '_positive', '_negative', 'zero_count', 'count')
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy должна быть в интервале (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value  # |x| меньше этого считается нулем
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _store_and_key(self, value: float) -> Tuple[Optional[Dict[int, int]], int]:
+        """Корзина значения: (хранилище, ключ); для нуля хранилище None"""
+        if abs(value) < self.min_value:
+            return None, 0
+        key = math.ceil(math.log(abs(value)) / self._log_gamma)
+        return (self._positive if value > 0 else self._negative), key
+
+    def add(self, value: float, count: int = 1):
+        """Добавляет значение count раз"""
+        store, key = self._store_and_key(value)
+        if store is None:
+            self.zero_count += count
+        else:
+            store[key] = store.get(key, 0) + count
+        self.count += count
+
+    def remove(self, value: float, count: int = 1):
+        """Вычитает ранее добавленное значение (отсутствующее значение игнорируется)"""
+        store, key = self._store_and_key(value)
+        if store is None:
+            removed = min(count, self.zero_count)
+            self.zero_count -= removed
+        else:
+            present = store.get(key, 0)
+            removed = min(count, present)
+            if present - removed > 0:
+                store[key] = present - removed
+            else:
+                store.pop(key, None)
+        self.count -= removed
+
+    def merge(self, other: 'QuantileSketch'):
+        """Добавляет к скетчу все значения другого скетча той же точности"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Нельзя объединить скетчи с разной точностью")
+        for key, count in other._positive.items():
+            self._positive[key] = self._positive.get(key, 0) + count
+        for key, count in other._negative.items():
+            self._negative[key] = self._negative.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def copy(self) -> 'QuantileSketch':
+        sketch = QuantileSketch(self.relative_accuracy, self.min_value)
+        sketch.merge(self)
+        return sketch
+
+    def _value(self, key: int) -> float:
+        """Середина корзины (в относительном смысле)"""
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def _ordered_bins(self) -> Iterator[Tuple[float, int]]:
+        """Корзины по возрастанию значений: отрицательные, ноль, положительные"""
+        for key in sorted(self._negative, reverse=True):
+            yield -self._value(key), self._negative[key]
+        if self.zero_count:
+            yield 0.0, self.zero_count
+        for key in sorted(self._positive):
+            yield self._value(key), self._positive[key]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Оценка квантиля q (0..1) или None для пустого скетча"""
+        return self.quantiles([q])[q]
+
+    def quantiles(self, qs: Iterable[float]) -> Dict[float, Optional[float]]:
+        """Оценки нескольких квантилей за один проход по корзинам"""
+        qs = sorted(qs)
+        if self.count <= 0:
+            return {q: None for q in qs}
+        result = {}
+        pending = iter(qs)
+        q = next(pending, None)
+        seen = 0
+        for value, count in self._ordered_bins():
+            seen += count
+            while q is not None and seen > q * (self.count - 1):
+                result[q] = value
+                q = next(pending, None)
+            if q is None:
+                break
+        # Округления на последней корзине: оставшиеся квантили равны максимуму
+        while q is not None:
+            result[q] = value
+            q = next(pending, None)
+        return result
+
+    def to_dict(self) -> dict:
+        """Представление для JSON (ключи корзин - строки)"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'min_value': self.min_value,
+            'positive': {str(key): count for key, count in self._positive.items()},
+            'negative': {str(key): count for key, count in self._negative.items()},
+            'zero_count': self.zero_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'QuantileSketch':
+        sketch = cls(data['relative_accuracy'], data['min_value'])
+        sketch._positive = {int(key): count for key, count in data['positive'].items()}
+        sketch._negative = {int(key): count for key, count in data['negative'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = (sum(sketch._positive.values()) + sum(sketch._negative.values())
+                        + sketch.zero_count)
+        return sketch
@@ -0,0 +1,160 @@
+import uuid
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+from core.models import Task, Priority, TaskStatus
+
+# Порядок кодов для uint8-колонок статуса и приоритета
+PRIORITY_CODES = list(Priority)
+STATUS_CODES = list(TaskStatus)
+_PRIORITY_TO_CODE = {priority: code for code, priority in enumerate(PRIORITY_CODES)}
+_STATUS_TO_CODE = {status: code for code, status in enumerate(STATUS_CODES)}
+
+# Даты хранятся как микросекунды от эпохи (наивное время, без сдвига часового пояса)
+EPOCH = datetime(1970, 1, 1)
+NO_DATE = -2 ** 63
+_MICROSECOND = timedelta(microseconds=1)
+_ID_SIZE = 16
+
+
+def datetime_to_epoch(value: Optional[datetime]) -> int:
+    """Конвертирует datetime в микросекунды от эпохи (NO_DATE для None)"""
+    if value is None:
+        return NO_DATE
+    return (value - EPOCH) // _MICROSECOND
+
+
+def epoch_to_datetime(value: int) -> Optional[datetime]:
+    """Конвертирует микросекунды от эпохи обратно в datetime"""
+    if value == NO_DATE:
+        return None
+    return EPOCH + timedelta(microseconds=value)
+
+
+class TaskTable:
+    """Компактное колоночное хранилище задач.
+
+    Даты лежат в массивах int64, статус и приоритет - в массивах uint8, UUID-идентификаторы
+    упакованы по 16 байт. Объекты Task создаются только при обращении к строке.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self._ids = bytearray()
+        self._odd_ids: Dict[int, str] = {}  # строка -> id, который не является UUID
+        self._rows: Dict[str, int] = {}
+        self.titles: List[str] = []
+        self.descriptions: List[str] = []
+        self.priority_codes = array('B')
+        self.status_codes = array('B')
+        self.due_dates = array('q')
+        self.created_dates = array('q')
+        self.completed_dates = array('q')
+        self.reminder_times = array('q')
+        for task in tasks:
+            self.append(task)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._rows
+
+    def __iter__(self) -> Iterator[Task]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def __getitem__(self, row: int) -> Task:
+        """Создает Task для строки таблицы"""
+        return Task(
+            id=self.task_id(row),
+            title=self.titles[row],
+            description=self.descriptions[row],
+            priority=PRIORITY_CODES[self.priority_codes[row]],
+            status=STATUS_CODES[self.status_codes[row]],
+            due_date=epoch_to_datetime(self.due_dates[row]),
+            created_date=epoch_to_datetime(self.created_dates[row]),
+            completed_date=epoch_to_datetime(self.completed_dates[row]),
+            reminder_time=epoch_to_datetime(self.reminder_times[row])
+        )
+
+    def task_id(self, row: int) -> str:
+        """Возвращает id задачи в строке без создания Task"""
+        if row in self._odd_ids:
+            return self._odd_ids[row]
+        offset = row * _ID_SIZE
+        return str(uuid.UUID(bytes=bytes(self._ids[offset:offset + _ID_SIZE])))
+
+    def row_of(self, task_id: str) -> Optional[int]:
+        """Возвращает номер строки задачи или None"""
+        return self._rows.get(task_id)
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """Получает задачу по id"""
+        row = self._rows.get(task_id)
+        return self[row] if row is not None else None
+
+    def _pack_id(self, row: int, task_id: str) -> bytes:
+        """Упаковывает UUID в 16 байт; прочие id уходят в отдельный словарь"""
+        self._odd_ids.pop(row, None)
+        try:
+            packed = uuid.UUID(task_id).bytes
+        except ValueError:
+            self._odd_ids[row] = task_id
+            return bytes(_ID_SIZE)
+        # Не каноническую запись UUID храним как есть, чтобы id не поменялся
+        if str(uuid.UUID(bytes=packed)) != task_id:
+            self._odd_ids[row] = task_id
+        return packed
+
+    def append(self, task: Task):
+        """Добавляет задачу в конец таблицы (или обновляет существующую)"""
+        if task.id in self._rows:
+            self.update(task)
+            return
+
+        row = len(self)
+        self._rows[task.id] = row
+        self._ids += self._pack_id(row, task.id)
+        self.titles.append(task.title)
+        self.descriptions.append(task.description)
+        self.priority_codes.append(_PRIORITY_TO_CODE[task.priority])
+        self.status_codes.append(_STATUS_TO_CODE[task.status])
+        self.due_dates.append(datetime_to_epoch(task.due_date))
+        self.created_dates.append(datetime_to_epoch(task.created_date))
+        self.completed_dates.append(datetime_to_epoch(task.completed_date))
+        self.reminder_times.append(datetime_to_epoch(task.reminder_time))
+
+    def update(self, task: Task):
+        """Перезаписывает строку существующей задачи"""
+        row = self._rows[task.id]
+        self.titles[row] = task.title
+        self.descriptions[row] = task.description
+        self.priority_codes[row] = _PRIORITY_TO_CODE[task.priority]
+        self.status_codes[row] = _STATUS_TO_CODE[task.status]
+        self.due_dates[row] = datetime_to_epoch(task.due_date)
+        self.created_dates[row] = datetime_to_epoch(task.created_date)
+        self.completed_dates[row] = datetime_to_epoch(task.completed_date)
+        self.reminder_times[row] = datetime_to_epoch(task.reminder_time)
+
+    def remove(self, task_id: str):
+        """Удаляет задачу за O(1): последняя строка переезжает на место удаленной"""
+        row = self._rows.pop(task_id)
+        last = len(self) - 1
+        columns = (self.titles, self.descriptions, self.priority_codes, self.status_codes,
+                   self.due_dates, self.created_dates, self.completed_dates, self.reminder_times)
+
+        if row != last:
+            last_id = self.task_id(last)
+            for column in columns:
+                column[row] = column[last]
+            self._ids[row * _ID_SIZE:(row + 1) * _ID_SIZE] = \
+                self._ids[last * _ID_SIZE:(last + 1) * _ID_SIZE]
+            self._odd_ids.pop(row, None)
+            if last in self._odd_ids:
+                self._odd_ids[row] = self._odd_ids.pop(last)
+            self._rows[last_id] = row
+
+        for column in columns:
+            column.pop()
+        del self._ids[last * _ID_SIZE:]
+        self._odd_ids.pop(last, None)
@@ -1,32 +1,31 @@
-import json
 import os
-from datetime import datetime
+from repository.task_repository import create_task_repository
+from utils.config import STORAGE_BACKEND, TASKS_DB_FILE, TASKS_FILE
 
 
 def debug_tasks():
-    """Проверяет содержимое файла tasks.json"""
-    data_file = os.path.join(os.path.expanduser("~"), ".smart_planner", "tasks.json")
+    """Проверяет задачи хранилища, выбранного в конфиге (снимок вместе с журналом)"""
+    data_file = TASKS_DB_FILE if STORAGE_BACKEND == "sqlite" else TASKS_FILE
 
     if not os.path.exists(data_file):
-        print("Файл tasks.json не существует!")
+        print(f"Файл {os.path.basename(data_file)} не существует!")
         return
 
-    with open(data_file, 'r', encoding='utf-8') as f:
-        try:
-            tasks = json.load(f)
-            print(f"Найдено задач: {len(tasks)}")
+    try:
+        tasks = create_task_repository().get_all_tasks()
+        print(f"Хранилище: {STORAGE_BACKEND}, найдено задач: {len(tasks)}")
 
-            for i, task in enumerate(tasks):
-                print(f"\n--- Задача {i + 1} ---")
-                print(f"ID: {task.get('id', 'N/A')}")
-                print(f"Название: {task.get('title', 'N/A')}")
-                print(f"Статус: {task.get('status', 'N/A')}")
-                print(f"Дата выполнения: {task.get('due_date', 'N/A')}")
-                print(f"Описание: {task.get('description', 'N/A')}")
+        for i, task in enumerate(tasks):
+            print(f"\n--- Задача {i + 1} ---")
+            print(f"ID: {task.id}")
+            print(f"Название: {task.title}")
+            print(f"Статус: {task.status.value}")
+            print(f"Дата выполнения: {task.due_date.isoformat()}")
+            print(f"Описание: {task.description}")
 
-        except Exception as e:
-            print(f"Ошибка чтения файла: {e}")
+    except Exception as e:
+        print(f"Ошибка чтения хранилища: {e}")
 
 
 if __name__ == "__main__":
-    debug_tasks()
\ No newline at end of file
+    debug_tasks()
@@ -1,14 +1,31 @@
 from kivy.app import App
+from kivy.core.window import Window
 from kivy.uix.screenmanager import ScreenManager
+from utils.metrics import get_logger, metrics, setup_logging
+from utils.profiling import start_profiling
+
+logger = get_logger(__name__)
+
+# F12 выводит в лог снимок метрик (p50/p95/max по операциям) и пишет отчеты профилирования
+METRICS_DUMP_KEY = 293
 
 
 class SmartPlannerApp(App):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.task_service = None
+        self.async_task_service = None
+        self.analytics_service = None
+        self.calendar_service = None
+        self.profiling = None
         self.selected_task_id = None  # Для хранения выбранной задачи из календаря
 
     def build(self):
+        setup_logging()
+        Window.bind(on_keyboard=self._on_keyboard)
+        # Профилирование по SMART_PLANNER_PROFILE=1: оборачивает классы до их создания
+        self.profiling = start_profiling()
+
         from ui.screens.main_screen import MainScreen
         from ui.screens.task_editor import TaskEditorScreen
         from ui.screens.calendar_view import CalendarScreen
@@ -17,18 +34,55 @@ class SmartPlannerApp(App):
         # Инициализируем сервисы
         from services.task_service import TaskService
         self.task_service = TaskService()
+        self.task_service.restore_reminders()
+        # Экраны обращаются к хранилищу через фоновый поток, чтобы интерфейс не замирал
+        from services.async_task_service import AsyncTaskService
+        self.async_task_service = AsyncTaskService(self.task_service)
+        # Статистика обновляется по событиям задач, а не пересчетом всех задач
+        from services.analytics_service import AnalyticsService
+        self.analytics_service = AnalyticsService(self.task_service)
+        # Сводки месяцев календаря кэшируются и сбрасываются по событиям задач
+        from services.calendar_service import CalendarService
+        self.calendar_service = CalendarService(self.task_service)
 
         # Передаем сервисы в экраны
+        services = dict(task_service=self.task_service, async_service=self.async_task_service)
         sm = ScreenManager()
-        sm.add_widget(MainScreen(name='main', task_service=self.task_service))
-        sm.add_widget(TaskEditorScreen(name='task_editor', task_service=self.task_service))
-        sm.add_widget(CalendarScreen(name='calendar', task_service=self.task_service))
-        sm.add_widget(StatisticsScreen(name='statistics', task_service=self.task_service))
+        sm.add_widget(MainScreen(name='main', **services))
+        sm.add_widget(TaskEditorScreen(name='task_editor', **services))
+        sm.add_widget(CalendarScreen(name='calendar', calendar_service=self.calendar_service,
+                                     **services))
+        sm.add_widget(StatisticsScreen(name='statistics', analytics_service=self.analytics_service,
+                                       **services))
 
         # Сохраняем ссылку на менеджер для доступа из экранов
         self.sm = sm
         return sm
 
+    def _on_keyboard(self, window, key, *args):
+        if key == METRICS_DUMP_KEY:
+            self.dump_metrics()
+            if self.profiling:
+                self.profiling.write_reports()
+            return True
+        return False
+
+    def dump_metrics(self):
+        """Выводит в лог снимок метрик сервиса и репозиториев"""
+        logger.info("Метрики:\n%s", metrics.format_snapshot())
+
+    def on_stop(self):
+        # Дожидаемся фоновых операций и записываем отложенные изменения перед выходом
+        if self.async_task_service:
+            self.async_task_service.shutdown()
+        elif self.task_service:
+            self.task_service.flush()
+        if self.analytics_service:
+            self.analytics_service.flush()
+        self.dump_metrics()
+        if self.profiling:
+            self.profiling.write_reports()
+
 
 if __name__ == '__main__':
     SmartPlannerApp().run()
\ No newline at end of file
@@ -0,0 +1,15 @@
+from services.analytics_service import AnalyticsService
+from services.task_service import TaskService
+
+
+def rebuild_statistics():
+    """Пересчитывает statistics.json по всем задачам (если счетчики разошлись с задачами)"""
+    analytics_service = AnalyticsService(TaskService())
+    analytics_service.rebuild()
+    summary = analytics_service.get_summary()
+    print(f"Задач: {summary['total_tasks']}, выполнено: {summary['completed_tasks']} "
+          f"({summary['productivity_percent']}%)")
+
+
+if __name__ == "__main__":
+    rebuild_statistics()
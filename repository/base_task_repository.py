@@ -0,0 +1,85 @@
+from datetime import datetime, date
+from typing import Dict, List, Optional
+from core.models import Task, LazyTask, Priority
+
+
+class BaseTaskRepository:
+    """Общий интерфейс хранилищ задач и преобразование задач в словари.
+
+    Хранилища (JSON-файл, журнал, SQLite) реализуют методы ниже; сервисы работают
+    только с ними и не зависят от способа хранения.
+    """
+
+    def _task_to_dict(self, task: Task) -> dict:
+        """Конвертирует Task в словарь"""
+        # Неизмененная ленивая задача уже хранит готовый словарь
+        if isinstance(task, LazyTask) and task.raw is not None:
+            return task.raw
+
+        return {
+            'id': task.id,
+            'title': task.title,
+            'description': task.description,
+            'priority': task.priority.value,
+            'status': task.status.value,
+            'due_date': task.due_date.isoformat(),
+            'created_date': task.created_date.isoformat(),
+            'completed_date': task.completed_date.isoformat() if task.completed_date else None,
+            'reminder_time': task.reminder_time.isoformat() if task.reminder_time else None
+        }
+
+    def _dict_to_task(self, data: dict) -> Task:
+        """Конвертирует словарь в Task; даты и перечисления разбираются лениво"""
+        return LazyTask(data)
+
+    def transaction(self):
+        """Контекстный менеджер: одна запись изменений в хранилище в конце, откат при ошибке"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Немедленно записывает отложенные изменения"""
+        raise NotImplementedError
+
+    def add_task(self, task: Task):
+        """Добавляет новую задачу"""
+        raise NotImplementedError
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Получает задачу по ID"""
+        raise NotImplementedError
+
+    def get_all_tasks(self) -> List[Task]:
+        """Получает все задачи"""
+        raise NotImplementedError
+
+    def update_task(self, task: Task):
+        """Обновляет задачу; TaskNotFoundException, если ее нет"""
+        raise NotImplementedError
+
+    def delete_task(self, task_id: str):
+        """Удаляет задачу по ID; TaskNotFoundException, если ее нет"""
+        raise NotImplementedError
+
+    def get_tasks_by_date(self, date: datetime) -> List[Task]:
+        """Получает задачи на определенную дату"""
+        raise NotImplementedError
+
+    def get_tasks_in_range(self, start: datetime, end: datetime) -> List[Task]:
+        """Получает задачи со сроком start <= due_date < end"""
+        raise NotImplementedError
+
+    def count_tasks_by_day(self, start: datetime, end: datetime) -> Dict[date, int]:
+        """Считает задачи по дням для start <= due_date < end"""
+        raise NotImplementedError
+
+    def get_completed_tasks(self) -> List[Task]:
+        """Получает все выполненные задачи"""
+        raise NotImplementedError
+
+    def get_pending_tasks(self) -> List[Task]:
+        """Получает все невыполненные задачи"""
+        raise NotImplementedError
+
+    def get_tasks_by_priority(self, priority: Priority) -> List[Task]:
+        """Получает задачи по приоритету"""
+        raise NotImplementedError
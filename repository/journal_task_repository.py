@@ -0,0 +1,186 @@
+import os
+import threading
+from typing import List, Optional, Tuple
+from core.models import Task
+from repository.serializers import get_serializer
+from repository.task_repository import TaskRepository
+from utils.metrics import instrumented, metrics
+from utils.config import (TASKS_FILE, JOURNAL_COMPACT_BYTES, JOURNAL_COMPACT_RATIO,
+                          JOURNAL_COMPACT_MIN_OPS, SERIALIZER)
+
+
+def journal_files(storage_file: str) -> Tuple[str, str]:
+    """Файлы журнала хранилища в порядке проигрывания: незавершенное сжатие, затем журнал"""
+    return storage_file + '.journal.compacting', storage_file + '.journal'
+
+
+def has_journal(storage_file: str) -> bool:
+    """Проверяет, остался ли у хранилища журнал операций"""
+    return any(os.path.exists(path) for path in journal_files(storage_file))
+
+
+def replay_journal(path: str, records: dict, serializer) -> int:
+    """Применяет операции из журнала к словарю записей, возвращает число операций"""
+    try:
+        with open(path, 'rb') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return 0
+
+    applied = 0
+    for line in lines:
+        try:
+            entry = serializer.loads(line)
+        except ValueError:
+            # Оборванная последняя строка после сбоя
+            continue
+
+        op = entry.get('op')
+        if op in ('add', 'update'):
+            records[entry['task']['id']] = entry['task']
+        elif op == 'delete':
+            records.pop(entry['id'], None)
+        else:
+            continue
+        applied += 1
+    return applied
+
+
+def load_tasks_data(storage_file: str = TASKS_FILE) -> List[dict]:
+    """Читает задачи хранилища (снимок и журнал) в виде словарей без создания репозитория"""
+    serializer = get_serializer(SERIALIZER)
+    try:
+        with open(storage_file, 'rb') as f:
+            snapshot = serializer.loads(f.read())
+    except (ValueError, FileNotFoundError):
+        snapshot = []
+
+    records = {task_data['id']: task_data for task_data in snapshot}
+    for path in journal_files(storage_file):
+        replay_journal(path, records, serializer)
+    return list(records.values())
+
+
+@instrumented(extra_methods=('_load_tasks', '_append_pending'))
+class JournalTaskRepository(TaskRepository):
+    """Хранилище задач: снимок (tasks.json) + журнал операций в формате JSON Lines.
+
+    Каждое изменение дописывает одну строку в журнал вместо перезаписи всего файла.
+    Снимок имеет тот же формат, что и обычный tasks.json, поэтому существующие файлы
+    подхватываются без конвертации.
+    """
+
+    def __init__(self, storage_file=TASKS_FILE):
+        self.compacting_file, self.journal_file = journal_files(storage_file)
+        self._journal_ops = 0
+        self._pending_lines = []
+        self._compaction_thread = None
+        super().__init__(storage_file)
+
+    def _file_signature(self):
+        """Подпись снимка и обоих файлов журнала"""
+        signatures = []
+        for path in (self.storage_file, self.compacting_file, self.journal_file):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                signatures.append(None)
+                continue
+            signatures.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        return tuple(signatures)
+
+    def _fold_leftover_journal(self):
+        """Журнал здесь рабочий: он проигрывается при каждой загрузке"""
+
+    def _load_tasks(self) -> List[dict]:
+        """Загружает снимок и проигрывает поверх него журнал"""
+        records = {task_data['id']: task_data for task_data in super()._load_tasks()}
+        # Незавершенное сжатие: его операции идут раньше текущего журнала
+        self._journal_ops = replay_journal(self.compacting_file, records, self._serializer)
+        self._journal_ops += replay_journal(self.journal_file, records, self._serializer)
+        return list(records.values())
+
+    def _persist(self, op: str, task_id: str, task: Optional[Task] = None):
+        """Ставит операцию в очередь на дозапись в журнал"""
+        if op == 'delete':
+            entry = {'op': op, 'id': task_id}
+        else:
+            entry = {'op': op, 'task': self._task_to_dict(task)}
+
+        self._pending_lines.append(self._serializer.dumps(entry))
+        self._journal_ops += 1
+        super()._persist(op, task_id, task)
+
+    def _append_pending(self):
+        """Дописывает накопленные операции в журнал одной записью"""
+        if not self._pending_lines:
+            return
+
+        with open(self.journal_file, 'ab') as f:
+            f.write(b''.join(line + b'\n' for line in self._pending_lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._pending_lines = []
+        self._cache_signature = self._file_signature()
+
+    def _write_pending(self):
+        """Записывает накопленные операции и при необходимости сжимает журнал"""
+        self._append_pending()
+        self._maybe_compact()
+
+    def _discard_pending(self):
+        """Отбрасывает операции, еще не дописанные в журнал"""
+        self._pending_lines = []
+        super()._discard_pending()
+
+    def _needs_compaction(self) -> bool:
+        """Проверяет, превысил ли журнал порог размера или числа операций"""
+        if self._journal_ops >= max(JOURNAL_COMPACT_MIN_OPS,
+                                    JOURNAL_COMPACT_RATIO * len(self._cache)):
+            return True
+        try:
+            return os.path.getsize(self.journal_file) >= JOURNAL_COMPACT_BYTES
+        except FileNotFoundError:
+            return False
+
+    def _maybe_compact(self):
+        """Запускает фоновое сжатие журнала, если пора"""
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            return
+        if not self._needs_compaction():
+            return
+
+        self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+        self._compaction_thread.start()
+
+    def compact(self):
+        """Записывает новый снимок и удаляет проигранный журнал"""
+        metrics.increment("JournalTaskRepository.compactions")
+        with self._lock:
+            self._get_cache()
+            self._append_pending()
+            if os.path.exists(self.compacting_file):
+                # Предыдущее сжатие не завершилось: его операции уже в кэше
+                with open(self.compacting_file, 'ab') as dst:
+                    if os.path.exists(self.journal_file):
+                        with open(self.journal_file, 'rb') as src:
+                            dst.write(src.read())
+                        os.remove(self.journal_file)
+            elif os.path.exists(self.journal_file):
+                os.replace(self.journal_file, self.compacting_file)
+            else:
+                return
+            snapshot = [self._task_to_dict(task) for task in self._cache.values()]
+            self._journal_ops = 0
+            self._cache_signature = self._file_signature()
+
+        # Тяжелая запись снимка идет без блокировки: новые операции
+        # в это время дописываются в свежий журнал
+        self._save_tasks(snapshot)
+        os.remove(self.compacting_file)
+
+        with self._lock:
+            journal_signature = self._file_signature()[2]
+            if self._cache_signature and self._cache_signature[2] == journal_signature:
+                self._cache_signature = self._file_signature()
@@ -0,0 +1,136 @@
+import bisect
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List
+from core.models import Reminder
+from repository.serializers import get_serializer
+from repository.storage import atomic_write
+from utils.config import ensure_data_dir, REMINDERS_FILE, SERIALIZER
+
+
+class ReminderRepository:
+    """Хранилище напоминаний (по одному на задачу).
+
+    Файл хранится отсортированным по времени, а неотправленные напоминания дополнительно
+    лежат в отсортированном индексе, поэтому выборка "после момента" - это бинарный поиск.
+    Отправленные напоминания из файла удаляются: он содержит только активные записи,
+    и его размер не растет с каждым показанным напоминанием.
+    """
+
+    def __init__(self, storage_file=REMINDERS_FILE):
+        ensure_data_dir()
+        self.storage_file = storage_file
+        self._serializer = get_serializer(SERIALIZER)
+        self._lock = threading.RLock()
+        self._reminders: Dict[str, Reminder] = {}  # task_id -> Reminder
+        self._pending: List[tuple] = []  # отсортированные (время, task_id) неотправленных
+        self._load()
+
+    def _load(self):
+        """Загружает напоминания из файла и строит индекс неотправленных"""
+        try:
+            with open(self.storage_file, 'rb') as f:
+                reminders_data = self._serializer.loads(f.read())
+        except (ValueError, FileNotFoundError):
+            reminders_data = []
+
+        pruned = False
+        for data in reminders_data:
+            if data['is_sent']:
+                # Запись старого формата: отправленные напоминания раньше оставались в файле
+                pruned = True
+                continue
+            reminder = Reminder(
+                id=data['id'],
+                task_id=data['task_id'],
+                reminder_time=datetime.fromisoformat(data['reminder_time']),
+                is_sent=data['is_sent']
+            )
+            self._reminders[reminder.task_id] = reminder
+            self._pending.append((reminder.reminder_time, reminder.task_id))
+
+        # Файл пишется отсортированным, так что обычно сортировка не нужна
+        if any(a > b for a, b in zip(self._pending, self._pending[1:])):
+            self._pending.sort()
+        if pruned:
+            self._save()
+
+    def _save(self):
+        """Атомарно сохраняет напоминания, отсортированные по времени"""
+        reminders = sorted(self._reminders.values(), key=lambda r: (r.reminder_time, r.task_id))
+        reminders_data = [{
+            'id': reminder.id,
+            'task_id': reminder.task_id,
+            'reminder_time': reminder.reminder_time.isoformat(),
+            'is_sent': reminder.is_sent
+        } for reminder in reminders]
+
+        atomic_write(self.storage_file, self._serializer.dumps(reminders_data, indent=True))
+
+    def _unindex(self, reminder: Reminder):
+        """Убирает напоминание из индекса неотправленных"""
+        if reminder.is_sent:
+            return
+        key = (reminder.reminder_time, reminder.task_id)
+        position = bisect.bisect_left(self._pending, key)
+        if position < len(self._pending) and self._pending[position] == key:
+            del self._pending[position]
+
+    def save_reminders(self, reminders: Iterable[Reminder]):
+        """Добавляет или заменяет напоминания задач одной записью на диск"""
+        with self._lock:
+            for reminder in reminders:
+                previous = self._reminders.get(reminder.task_id)
+                if previous is not None:
+                    self._unindex(previous)
+                self._reminders[reminder.task_id] = reminder
+                if not reminder.is_sent:
+                    bisect.insort(self._pending, (reminder.reminder_time, reminder.task_id))
+            self._save()
+
+    def delete_for_tasks(self, task_ids: Iterable[str]):
+        """Удаляет напоминания задач"""
+        with self._lock:
+            changed = False
+            for task_id in task_ids:
+                reminder = self._reminders.pop(task_id, None)
+                if reminder is not None:
+                    self._unindex(reminder)
+                    changed = True
+            if changed:
+                self._save()
+
+    def mark_sent(self, task_ids: Iterable[str]):
+        """Отмечает напоминания задач как отправленные, удаляя их записи.
+
+        Напоминание, перенесенное на будущее после срабатывания, остается в силе.
+        """
+        now = datetime.now()
+        with self._lock:
+            changed = False
+            for task_id in task_ids:
+                reminder = self._reminders.get(task_id)
+                if reminder is not None and reminder.reminder_time <= now:
+                    self._unindex(reminder)
+                    reminder.is_sent = True
+                    del self._reminders[task_id]
+                    changed = True
+            if changed:
+                self._save()
+
+    def get_reminder(self, task_id: str):
+        """Получает напоминание задачи"""
+        with self._lock:
+            return self._reminders.get(task_id)
+
+    def get_pending_after(self, moment: datetime) -> List[Reminder]:
+        """Неотправленные напоминания со временем позже moment"""
+        with self._lock:
+            start = bisect.bisect_right(self._pending, (moment, chr(0x10FFFF)))
+            return [self._reminders[task_id] for _, task_id in self._pending[start:]]
+
+    def get_missed(self, moment: datetime) -> List[Reminder]:
+        """Неотправленные напоминания, время которых уже наступило к moment"""
+        with self._lock:
+            end = bisect.bisect_right(self._pending, (moment, chr(0x10FFFF)))
+            return [self._reminders[task_id] for _, task_id in self._pending[:end]]
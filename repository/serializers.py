@@ -0,0 +1,46 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonSerializer:
+    """Сериализатор на стандартном модуле json"""
+
+    name = "json"
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+    def dumps(self, obj, indent: bool = False) -> bytes:
+        text = json.dumps(obj, indent=2 if indent else None, default=str, ensure_ascii=False)
+        return text.encode('utf-8')
+
+
+class OrjsonSerializer:
+    """Быстрый сериализатор на orjson (тот же JSON на выходе)"""
+
+    name = "orjson"
+
+    def loads(self, data: bytes):
+        return orjson.loads(data)
+
+    def dumps(self, obj, indent: bool = False) -> bytes:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=str, option=option)
+
+
+SERIALIZERS = {"json": JsonSerializer}
+if orjson is not None:
+    SERIALIZERS["orjson"] = OrjsonSerializer
+
+
+def get_serializer(name: str = "auto"):
+    """Возвращает сериализатор по имени; "auto" выбирает самый быстрый из установленных"""
+    if name == "auto":
+        name = "orjson" if "orjson" in SERIALIZERS else "json"
+    if name not in SERIALIZERS:
+        raise ValueError(f"Serializer is not available: {name}")
+    return SERIALIZERS[name]()
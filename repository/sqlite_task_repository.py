@@ -0,0 +1,227 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, date
+from typing import Dict, List, Optional
+from core.models import Task, TaskStatus, Priority
+from core.exceptions import TaskNotFoundException
+from repository.journal_task_repository import load_tasks_data
+from repository.base_task_repository import BaseTaskRepository
+from utils.metrics import get_logger, instrumented
+from utils.config import ensure_data_dir, TASKS_DB_FILE, TASKS_FILE
+
+COLUMNS = ('id', 'title', 'description', 'priority', 'status',
+           'due_date', 'created_date', 'completed_date', 'reminder_time')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    priority TEXT NOT NULL,
+    status TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    created_date TEXT NOT NULL,
+    completed_date TEXT,
+    reminder_time TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_reminder_time ON tasks (reminder_time);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Строка meta, которая появляется в одной транзакции с импортированными задачами
+IMPORTED_KEY = 'json_imported'
+
+
+logger = get_logger(__name__)
+
+
+@instrumented()
+class SqliteTaskRepository(BaseTaskRepository):
+    """Хранилище задач в SQLite с индексами по дате, статусу, приоритету и напоминанию"""
+
+    def __init__(self, db_file=TASKS_DB_FILE, import_file=TASKS_FILE):
+        ensure_data_dir()
+        self.storage_file = db_file
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        # Переносим задачи из JSON-файла, пока импорт не завершился (в том числе после сбоя)
+        if import_file and not self._is_imported():
+            if os.path.exists(import_file):
+                imported = self.import_json(import_file)
+                logger.info("Импортировано задач из JSON: %d", imported)
+            else:
+                with self._writing():
+                    self._mark_imported()
+
+    def _is_imported(self) -> bool:
+        """Проверяет, завершен ли перенос задач из JSON-файла"""
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = ?", (IMPORTED_KEY,)).fetchone():
+                return True
+            # База создана до появления отметки: задачи в ней уже свои
+            if self._conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone():
+                with self._writing():
+                    self._mark_imported()
+                return True
+            return False
+
+    def _mark_imported(self):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                           (IMPORTED_KEY, datetime.now().isoformat()))
+
+    @contextmanager
+    def _writing(self):
+        """Фиксирует изменения сразу, если не открыта внешняя транзакция"""
+        with self._lock:
+            if self._transaction_depth:
+                yield
+            else:
+                with self._conn:
+                    yield
+
+    @contextmanager
+    def transaction(self):
+        """Выполняет группу изменений в одной транзакции SQLite"""
+        with self._lock:
+            if self._transaction_depth:
+                self._transaction_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._transaction_depth -= 1
+                return
+
+            self._transaction_depth = 1
+            try:
+                with self._conn:
+                    yield self
+            finally:
+                self._transaction_depth = 0
+
+    def import_json(self, json_file: str) -> int:
+        """Однократно импортирует задачи из JSON-файла, возвращает их количество.
+
+        Файл читается как хранилище журнала: поверх снимка проигрываются операции
+        из tasks.json.journal и незавершенного сжатия, иначе последние изменения потеряются.
+        Отметка о завершении пишется в той же транзакции, так что прерванный импорт
+        повторится при следующем открытии.
+        """
+        tasks_data = load_tasks_data(json_file)
+        rows = [tuple(task_data.get(column) for column in COLUMNS) for task_data in tasks_data]
+        with self._writing():
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO tasks ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows
+            )
+            self._mark_imported()
+        return len(rows)
+
+    def _row_to_task(self, row: sqlite3.Row) -> Task:
+        """Конвертирует строку таблицы в Task"""
+        return self._dict_to_task(dict(row))
+
+    def _query(self, where: str = "", params: tuple = ()) -> List[Task]:
+        """Выполняет SELECT по таблице задач"""
+        sql = f"SELECT {', '.join(COLUMNS)} FROM tasks"
+        if where:
+            sql += f" WHERE {where}"
+        sql += " ORDER BY rowid"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_task(row) for row in rows]
+
+    def add_task(self, task: Task):
+        """Добавляет новую задачу"""
+        data = self._task_to_dict(task)
+        with self._writing():
+            self._conn.execute(
+                f"INSERT INTO tasks ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                tuple(data[column] for column in COLUMNS)
+            )
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Получает задачу по ID"""
+        tasks = self._query("id = ?", (task_id,))
+        return tasks[0] if tasks else None
+
+    def get_all_tasks(self) -> List[Task]:
+        """Получает все задачи"""
+        return self._query()
+
+    def update_task(self, task: Task):
+        """Обновляет задачу"""
+        data = self._task_to_dict(task)
+        assignments = ', '.join(f"{column} = ?" for column in COLUMNS[1:])
+        with self._writing():
+            cursor = self._conn.execute(
+                f"UPDATE tasks SET {assignments} WHERE id = ?",
+                tuple(data[column] for column in COLUMNS[1:]) + (task.id,)
+            )
+        if cursor.rowcount == 0:
+            raise TaskNotFoundException(f"Task with id {task.id} not found")
+
+    def delete_task(self, task_id: str):
+        """Удаляет задачу по ID"""
+        with self._writing():
+            cursor = self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        if cursor.rowcount == 0:
+            raise TaskNotFoundException(f"Task with id {task_id} not found")
+
+    def get_tasks_by_date(self, date: datetime) -> List[Task]:
+        """Получает задачи на определенную дату"""
+        day_start = datetime.combine(date.date(), datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        return self._query("due_date >= ? AND due_date < ?",
+                           (day_start.isoformat(), day_end.isoformat()))
+
+    def get_tasks_in_range(self, start: datetime, end: datetime) -> List[Task]:
+        """Получает задачи со сроком start <= due_date < end"""
+        return self._query("due_date >= ? AND due_date < ?", (start.isoformat(), end.isoformat()))
+
+    def count_tasks_by_day(self, start: datetime, end: datetime) -> Dict[date, int]:
+        """Считает задачи по дням для start <= due_date < end"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT substr(due_date, 1, 10), COUNT(*) FROM tasks "
+                "WHERE due_date >= ? AND due_date < ? GROUP BY 1",
+                (start.isoformat(), end.isoformat())
+            ).fetchall()
+        return {date.fromisoformat(day): count for day, count in rows}
+
+    def get_completed_tasks(self) -> List[Task]:
+        """Получает все выполненные задачи"""
+        return self._query("status = ?", (TaskStatus.COMPLETED.value,))
+
+    def get_pending_tasks(self) -> List[Task]:
+        """Получает все невыполненные задачи"""
+        pending = tuple(status.value for status in TaskStatus if status != TaskStatus.COMPLETED)
+        return self._query(f"status IN ({', '.join('?' * len(pending))})", pending)
+
+    def get_tasks_by_priority(self, priority: Priority) -> List[Task]:
+        """Получает задачи по приоритету"""
+        return self._query("priority = ?", (priority.value,))
+
+    def flush(self):
+        """Изменения фиксируются транзакциями сразу, отложенной записи нет"""
+
+    def close(self):
+        """Закрывает соединение с базой"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,145 @@
+import threading
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from core.models import DailyStatistics
+from core.quantile_sketch import QuantileSketch
+from repository.serializers import get_serializer
+from repository.storage import FlushTimer, atomic_write
+from utils.config import ensure_data_dir, STATISTICS_FILE, SERIALIZER, SKETCH_RELATIVE_ACCURACY
+
+# Значения скетчей - часы; все, что меньше секунды, считается нулем
+_SKETCH_MIN_HOURS = 1 / 3600
+
+
+class StatisticsRepository:
+    """Хранилище счетчиков статистики: общие итоги, счетчики по дням срока
+    и именованные скетчи квантилей.
+
+    Изменения применяются в памяти за O(1), а на диск записываются с той же
+    задержкой, что и задачи (SAVE_DEBOUNCE_SECONDS).
+    """
+
+    def __init__(self, storage_file=STATISTICS_FILE):
+        ensure_data_dir()
+        self.storage_file = storage_file
+        self._serializer = get_serializer(SERIALIZER)
+        self._lock = threading.RLock()
+        self.total_tasks = 0
+        self.completed_tasks = 0
+        self._days: Dict[date, List[int]] = {}  # день -> [всего, выполнено]
+        self._sketches: Dict[str, QuantileSketch] = {}
+        self._dirty = False
+        self._flush_timer = FlushTimer(self.flush)
+        # False, если файла нет или он поврежден: счетчики нужно перестроить
+        self.is_loaded = self._load()
+
+    def _load(self) -> bool:
+        """Загружает счетчики из файла"""
+        try:
+            with open(self.storage_file, 'rb') as f:
+                data = self._serializer.loads(f.read())
+            self.total_tasks = data['total_tasks']
+            self.completed_tasks = data['completed_tasks']
+            self._days = {date.fromisoformat(day): counts for day, counts in data['days'].items()}
+            self._sketches = {name: QuantileSketch.from_dict(sketch)
+                              for name, sketch in data['sketches'].items()}
+        except (ValueError, KeyError, FileNotFoundError):
+            return False
+        return True
+
+    def _save(self):
+        """Атомарно сохраняет счетчики"""
+        data = {
+            'total_tasks': self.total_tasks,
+            'completed_tasks': self.completed_tasks,
+            'days': {day.isoformat(): counts for day, counts in sorted(self._days.items())},
+            'sketches': {name: sketch.to_dict() for name, sketch in sorted(self._sketches.items())},
+        }
+        atomic_write(self.storage_file, self._serializer.dumps(data))
+
+    def _schedule_flush(self):
+        """Отмечает изменения и планирует их запись"""
+        self._dirty = True
+        self._flush_timer.schedule()
+
+    def flush(self):
+        """Немедленно записывает отложенные изменения на диск"""
+        with self._lock:
+            self._flush_timer.cancel()
+            if self._dirty:
+                self._save()
+                self._dirty = False
+
+    def add(self, day: date, total_delta: int, completed_delta: int):
+        """Изменяет итоги и счетчики дня на заданные величины"""
+        with self._lock:
+            self.total_tasks += total_delta
+            self.completed_tasks += completed_delta
+            counts = self._days.get(day)
+            if counts is None:
+                counts = self._days[day] = [0, 0]
+            counts[0] += total_delta
+            counts[1] += completed_delta
+            if counts[0] <= 0:
+                del self._days[day]
+            self._schedule_flush()
+
+    @staticmethod
+    def new_sketch() -> QuantileSketch:
+        """Пустой скетч с точностью из настроек"""
+        return QuantileSketch(SKETCH_RELATIVE_ACCURACY, _SKETCH_MIN_HOURS)
+
+    def add_sample(self, name: str, value: float, delta: int = 1):
+        """Добавляет значение в скетч name (delta=-1 вычитает его)"""
+        with self._lock:
+            sketch = self._sketches.get(name)
+            if sketch is None:
+                if delta <= 0:
+                    return
+                sketch = self._sketches[name] = self.new_sketch()
+            if delta > 0:
+                sketch.add(value, delta)
+            else:
+                sketch.remove(value, -delta)
+                if sketch.count <= 0:
+                    del self._sketches[name]
+            self._schedule_flush()
+
+    def get_sketch(self, name: str) -> Optional[QuantileSketch]:
+        """Копия скетча name или None, если значений нет"""
+        with self._lock:
+            sketch = self._sketches.get(name)
+            return sketch.copy() if sketch is not None else None
+
+    def replace_all(self, days: Dict[date, List[int]], sketches: Dict[str, QuantileSketch] = None):
+        """Заменяет все счетчики и скетчи (полная перестройка)"""
+        with self._lock:
+            self._days = days
+            self._sketches = sketches or {}
+            self.total_tasks = sum(counts[0] for counts in days.values())
+            self.completed_tasks = sum(counts[1] for counts in days.values())
+            self.is_loaded = True
+            self._dirty = True
+            self.flush()
+
+    def get_day(self, day: date) -> Optional[DailyStatistics]:
+        """Статистика одного дня или None, если задач на этот день нет"""
+        with self._lock:
+            counts = self._days.get(day)
+            return self._to_daily(day, counts) if counts else None
+
+    def get_days(self, start: date, end: date) -> List[DailyStatistics]:
+        """Статистика дней start <= день < end, в которые есть задачи"""
+        with self._lock:
+            return [self._to_daily(day, counts) for day, counts in sorted(self._days.items())
+                    if start <= day < end]
+
+    @staticmethod
+    def _to_daily(day: date, counts: List[int]) -> DailyStatistics:
+        total, completed = counts
+        return DailyStatistics(
+            date=datetime(day.year, day.month, day.day),
+            total_tasks=total,
+            completed_tasks=completed,
+            productivity_percent=completed / total * 100 if total else 0.0
+        )
@@ -0,0 +1,43 @@
+import os
+import threading
+from typing import Callable
+from utils.config import SAVE_DEBOUNCE_SECONDS
+
+
+def atomic_write(path: str, data: bytes):
+    """Атомарно записывает файл: временный файл, fsync, os.replace"""
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+class FlushTimer:
+    """Отложенная запись: изменения за SAVE_DEBOUNCE_SECONDS объединяются в одну.
+
+    Владелец вызывает schedule() и cancel() под своей блокировкой; flush владельца
+    сам должен вызывать cancel(), в том числе когда его запустил таймер.
+    """
+
+    def __init__(self, flush: Callable[[], None], delay: float = SAVE_DEBOUNCE_SECONDS):
+        self._flush = flush
+        self.delay = delay
+        self._timer = None
+
+    def schedule(self):
+        """Планирует flush, если он еще не запланирован; без задержки пишет сразу"""
+        if self.delay <= 0:
+            self._flush()
+            return
+        if self._timer is None:
+            self._timer = threading.Timer(self.delay, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        """Отменяет запланированный flush"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
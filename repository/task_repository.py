@@ -1,17 +1,44 @@
+import copy
 import json
 import os
-from typing import List, Optional
-from datetime import datetime
-from core.models import Task, TaskStatus, Priority
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from datetime import datetime, date
+from core.models import Task, LazyTask, TaskStatus, Priority
 from core.exceptions import TaskNotFoundException
-from utils.config import ensure_data_dir, TASKS_FILE
+from repository.base_task_repository import BaseTaskRepository
+from repository.serializers import get_serializer
+from repository.storage import FlushTimer, atomic_write
+from utils.metrics import instrumented, metrics
+from utils.config import ensure_data_dir, TASKS_FILE, STORAGE_BACKEND, SERIALIZER
 
 
-class TaskRepository:
+@instrumented(extra_methods=('_load_tasks', '_save_tasks'))
+class TaskRepository(BaseTaskRepository):
     def __init__(self, storage_file=TASKS_FILE):
         ensure_data_dir()
         self.storage_file = storage_file
+        self._serializer = get_serializer(SERIALIZER)
+        # Кэш гидратированных задач: id -> Task (порядок как в файле)
+        self._cache: Dict[str, Task] = {}
+        self._cache_signature = None
+        # Вторичные индексы: ключ -> упорядоченное множество id (dict без значений)
+        self._by_date: Dict[int, Dict[str, None]] = {}
+        # Статус и приоритет индексируются по строковому значению: хэш Enum медленный
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._by_priority: Dict[str, Dict[str, None]] = {}
+        # Ключи, под которыми задача лежит в индексах: id -> (дата, статус, приоритет)
+        self._index_keys: Dict[str, tuple] = {}
+        # Индексы строятся при первом запросе по ним, а не при каждой загрузке файла
+        self._indexes_ready = False
+        # Отложенная запись: изменения копятся в кэше и сбрасываются одним махом
+        self._dirty = False
+        self._flush_timer = FlushTimer(self.flush)
+        self._transaction_depth = 0
+        self._lock = threading.RLock()
         self._ensure_storage_exists()
+        self._fold_leftover_journal()
 
     def _ensure_storage_exists(self):
         """Создает файл хранилища если он не существует"""
@@ -19,123 +46,292 @@ class TaskRepository:
             with open(self.storage_file, 'w', encoding='utf-8') as f:
                 json.dump([], f)
 
+    def _fold_leftover_journal(self):
+        """Сжимает журнал, оставшийся от хранилища "journal", в снимок.
+
+        Без этого его операции не видны, а после возврата к журналу они проиграются
+        поверх снимка и перезапишут изменения, сделанные без журнала.
+        """
+        # Импорт здесь: journal_task_repository сам импортирует этот модуль
+        from repository.journal_task_repository import JournalTaskRepository, has_journal
+        if has_journal(self.storage_file):
+            JournalTaskRepository(self.storage_file).compact()
+
     def _load_tasks(self) -> List[dict]:
         """Загружает задачи из JSON файла"""
         try:
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+            with open(self.storage_file, 'rb') as f:
+                return self._serializer.loads(f.read())
+        except (ValueError, FileNotFoundError):
             return []
 
     def _save_tasks(self, tasks_data: List[dict]):
-        """Сохраняет задачи в JSON файл"""
-        with open(self.storage_file, 'w', encoding='utf-8') as f:
-            json.dump(tasks_data, f, indent=2, default=str, ensure_ascii=False)
-
-    def _task_to_dict(self, task: Task) -> dict:
-        """Конвертирует Task в словарь"""
-        return {
-            'id': task.id,
-            'title': task.title,
-            'description': task.description,
-            'priority': task.priority.value,
-            'status': task.status.value,
-            'due_date': task.due_date.isoformat(),
-            'created_date': task.created_date.isoformat(),
-            'completed_date': task.completed_date.isoformat() if task.completed_date else None,
-            'reminder_time': task.reminder_time.isoformat() if task.reminder_time else None
-        }
-
-    def _dict_to_task(self, data: dict) -> Task:
-        """Конвертирует словарь в Task"""
-        # Импортируем здесь чтобы избежать циклических импортов
-        from core.models import Task, Priority, TaskStatus
-
-        # Обрабатываем даты
-        due_date = datetime.fromisoformat(data['due_date'])
-        created_date = datetime.fromisoformat(data['created_date'])
-        completed_date = datetime.fromisoformat(data['completed_date']) if data['completed_date'] else None
-        reminder_time = datetime.fromisoformat(data['reminder_time']) if data['reminder_time'] else None
-
-        # Создаем объект Priority и TaskStatus из строк
-        priority = Priority(data['priority'])
-        status = TaskStatus(data['status'])
-
-        return Task(
-            id=data['id'],
-            title=data['title'],
-            description=data['description'],
-            priority=priority,
-            status=status,
-            due_date=due_date,
-            created_date=created_date,
-            completed_date=completed_date,
-            reminder_time=reminder_time
-        )
+        """Атомарно сохраняет задачи в JSON файл"""
+        atomic_write(self.storage_file, self._serializer.dumps(tasks_data, indent=True))
+
+    def _file_signature(self):
+        """Возвращает (mtime, size, inode) файла хранилища или None"""
+        try:
+            stat = os.stat(self.storage_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _get_cache(self) -> Dict[str, Task]:
+        """Возвращает кэш задач, перечитывая файл только если он изменился"""
+        if self._dirty:
+            # В кэше есть несохраненные изменения - он новее файла
+            return self._cache
+
+        signature = self._file_signature()
+        if self._cache_signature is None or signature != self._cache_signature:
+            dict_to_task = self._dict_to_task
+            self._cache = {task_data['id']: dict_to_task(task_data) for task_data in self._load_tasks()}
+            self._cache_signature = signature
+            self._indexes_ready = False
+            metrics.increment("TaskRepository.cache_reloads")
+        return self._cache
+
+    def _get_indexed_cache(self) -> Dict[str, Task]:
+        """Возвращает кэш задач с построенными вторичными индексами"""
+        cache = self._get_cache()
+        if not self._indexes_ready:
+            self._rebuild_indexes()
+            self._indexes_ready = True
+        return cache
+
+    def _rebuild_indexes(self):
+        """Полностью перестраивает вторичные индексы по кэшу"""
+        self._by_date = by_date = {}
+        self._by_status = by_status = {}
+        self._by_priority = by_priority = {}
+        self._index_keys = index_keys = {}
+        index_keys_for = self._index_keys_for
+        for task_id, task in self._cache.items():
+            keys = index_keys[task_id] = index_keys_for(task)
+            day, status, priority = keys
+            if day not in by_date:
+                by_date[day] = {}
+            by_date[day][task_id] = None
+            if status not in by_status:
+                by_status[status] = {}
+            by_status[status][task_id] = None
+            if priority not in by_priority:
+                by_priority[priority] = {}
+            by_priority[priority][task_id] = None
+
+    @staticmethod
+    def _index_keys_for(task: Task) -> tuple:
+        """Ключи индексов задачи: (ординал даты, значение статуса, значение приоритета)"""
+        raw = task.raw if isinstance(task, LazyTask) else None
+        if raw is not None:
+            # Не разбираем поля ленивой задачи ради индекса
+            return (date.fromisoformat(raw['due_date'][:10]).toordinal(),
+                    raw['status'], raw['priority'])
+        return task.due_date.toordinal(), task.status.value, task.priority.value
+
+    def _index_add(self, task: Task):
+        """Добавляет задачу во вторичные индексы"""
+        if not self._indexes_ready:
+            return
+        keys = self._index_keys_for(task)
+        self._by_date.setdefault(keys[0], {})[task.id] = None
+        self._by_status.setdefault(keys[1], {})[task.id] = None
+        self._by_priority.setdefault(keys[2], {})[task.id] = None
+        self._index_keys[task.id] = keys
+
+    def _index_remove(self, task_id: str):
+        """Удаляет задачу из вторичных индексов по сохраненным ключам"""
+        if not self._indexes_ready:
+            return
+        keys = self._index_keys.pop(task_id, None)
+        if keys is None:
+            return
+        for index, key in zip((self._by_date, self._by_status, self._by_priority), keys):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(task_id, None)
+                if not bucket:
+                    del index[key]
+
+    def _index_update(self, task: Task):
+        """Перемещает задачу в индексах, только если изменились ее ключи"""
+        if not self._indexes_ready:
+            return
+        keys = self._index_keys_for(task)
+        if self._index_keys.get(task.id) != keys:
+            self._index_remove(task.id)
+            self._index_add(task)
+
+    def _select_ids(self, task_ids) -> List[Task]:
+        """Возвращает копии задач из кэша по списку id (кэш должен быть актуален)"""
+        return [copy.copy(self._cache[task_id]) for task_id in task_ids]
+
+    def _commit(self):
+        """Записывает кэш в файл и запоминает новую подпись файла"""
+        self._save_tasks([self._task_to_dict(task) for task in self._cache.values()])
+        self._cache_signature = self._file_signature()
+
+    def _persist(self, op: str, task_id: str, task: Optional[Task] = None):
+        """Отмечает изменение одной задачи (op: add, update или delete) для записи"""
+        self._dirty = True
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Планирует запись; изменения внутри окна объединяются в одну запись"""
+        if self._transaction_depth:
+            # Внутри транзакции запись выполнится один раз при ее завершении
+            return
+        self._flush_timer.schedule()
+
+    def _write_pending(self):
+        """Записывает накопленные изменения на диск"""
+        self._commit()
+
+    def flush(self):
+        """Немедленно записывает отложенные изменения на диск"""
+        with self._lock:
+            self._flush_timer.cancel()
+            if self._dirty:
+                self._write_pending()
+                self._dirty = False
+
+    def _discard_pending(self):
+        """Отбрасывает несохраненные изменения; кэш перечитается из файла"""
+        self._dirty = False
+        self._cache_signature = None
+
+    @contextmanager
+    def transaction(self):
+        """Группирует изменения: одна запись на диск в конце, откат при ошибке"""
+        with self._lock:
+            if self._transaction_depth == 0:
+                # Сохраняем все, что было до транзакции, чтобы откат не потерял это
+                self.flush()
+            self._transaction_depth += 1
+            try:
+                yield self
+            except Exception:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self._discard_pending()
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.flush()
 
     def add_task(self, task: Task):
         """Добавляет новую задачу"""
-        tasks_data = self._load_tasks()
-        tasks_data.append(self._task_to_dict(task))
-        self._save_tasks(tasks_data)
+        with self._lock:
+            cache = self._get_cache()
+            if task.id in cache:
+                self._index_remove(task.id)
+            cache[task.id] = copy.copy(task)
+            self._index_add(task)
+            self._persist('add', task.id, task)
 
     def get_task(self, task_id: str) -> Optional[Task]:
         """Получает задачу по ID"""
-        tasks_data = self._load_tasks()
-        for task_data in tasks_data:
-            if task_data['id'] == task_id:
-                return self._dict_to_task(task_data)
-        return None
+        with self._lock:
+            task = self._get_cache().get(task_id)
+            return copy.copy(task) if task else None
 
     def get_all_tasks(self) -> List[Task]:
         """Получает все задачи"""
-        tasks_data = self._load_tasks()
-        return [self._dict_to_task(task_data) for task_data in tasks_data]
+        with self._lock:
+            return [copy.copy(task) for task in self._get_cache().values()]
 
     def update_task(self, task: Task):
         """Обновляет задачу"""
-        tasks_data = self._load_tasks()
-        task_found = False
-
-        for i, task_data in enumerate(tasks_data):
-            if task_data['id'] == task.id:
-                tasks_data[i] = self._task_to_dict(task)
-                task_found = True
-                break
-
-        if not task_found:
-            raise TaskNotFoundException(f"Task with id {task.id} not found")
+        with self._lock:
+            cache = self._get_cache()
+            if task.id not in cache:
+                raise TaskNotFoundException(f"Task with id {task.id} not found")
 
-        self._save_tasks(tasks_data)
+            cache[task.id] = copy.copy(task)
+            self._index_update(task)
+            self._persist('update', task.id, task)
 
     def delete_task(self, task_id: str):
         """Удаляет задачу по ID"""
-        tasks_data = self._load_tasks()
-        initial_length = len(tasks_data)
-        tasks_data = [task for task in tasks_data if task['id'] != task_id]
+        with self._lock:
+            cache = self._get_cache()
+            if task_id not in cache:
+                raise TaskNotFoundException(f"Task with id {task_id} not found")
 
-        if len(tasks_data) == initial_length:
-            raise TaskNotFoundException(f"Task with id {task_id} not found")
-
-        self._save_tasks(tasks_data)
+            del cache[task_id]
+            self._index_remove(task_id)
+            self._persist('delete', task_id)
 
     def get_tasks_by_date(self, date: datetime) -> List[Task]:
         """Получает задачи на определенную дату"""
-        all_tasks = self.get_all_tasks()
-        target_date = date.date()
-        return [task for task in all_tasks if task.due_date.date() == target_date]
+        with self._lock:
+            self._get_indexed_cache()
+            return self._select_ids(self._by_date.get(date.toordinal(), ()))
+
+    def _day_buckets_in_range(self, start: datetime, end: datetime):
+        """Перебирает (ординал, id задач дня) для start <= due_date < end.
+
+        Время срока проверяется только в крайних днях, внутренние дни берутся целиком.
+        """
+        first, last = start.toordinal(), end.toordinal()
+        for ordinal in range(first, last + 1):
+            bucket = self._by_date.get(ordinal)
+            if not bucket:
+                continue
+            if ordinal == first or ordinal == last:
+                bucket = [task_id for task_id in bucket
+                          if start <= self._cache[task_id].due_date < end]
+            yield ordinal, bucket
+
+    def get_tasks_in_range(self, start: datetime, end: datetime) -> List[Task]:
+        """Получает задачи со сроком start <= due_date < end"""
+        with self._lock:
+            self._get_indexed_cache()
+            result = []
+            for _, bucket in self._day_buckets_in_range(start, end):
+                result.extend(self._select_ids(bucket))
+            return result
+
+    def count_tasks_by_day(self, start: datetime, end: datetime) -> Dict[date, int]:
+        """Считает задачи по дням для start <= due_date < end без копирования задач"""
+        with self._lock:
+            self._get_indexed_cache()
+            return {date.fromordinal(ordinal): len(bucket)
+                    for ordinal, bucket in self._day_buckets_in_range(start, end) if bucket}
 
     def get_completed_tasks(self) -> List[Task]:
         """Получает все выполненные задачи"""
-        all_tasks = self.get_all_tasks()
-        return [task for task in all_tasks if task.status == TaskStatus.COMPLETED]
+        with self._lock:
+            self._get_indexed_cache()
+            return self._select_ids(self._by_status.get(TaskStatus.COMPLETED.value, ()))
 
     def get_pending_tasks(self) -> List[Task]:
         """Получает все невыполненные задачи"""
-        all_tasks = self.get_all_tasks()
-        return [task for task in all_tasks if task.status != TaskStatus.COMPLETED]
+        with self._lock:
+            self._get_indexed_cache()
+            task_ids = []
+            for status, bucket in self._by_status.items():
+                if status != TaskStatus.COMPLETED.value:
+                    task_ids.extend(bucket)
+            return self._select_ids(task_ids)
 
     def get_tasks_by_priority(self, priority: Priority) -> List[Task]:
         """Получает задачи по приоритету"""
-        all_tasks = self.get_all_tasks()
-        return [task for task in all_tasks if task.priority == priority]
\ No newline at end of file
+        with self._lock:
+            self._get_indexed_cache()
+            return self._select_ids(self._by_priority.get(priority.value, ()))
+
+
+def create_task_repository(backend: str = STORAGE_BACKEND) -> BaseTaskRepository:
+    """Создает репозиторий задач для выбранного в конфиге хранилища"""
+    # Импортируем здесь чтобы избежать циклических импортов
+    if backend == "journal":
+        from repository.journal_task_repository import JournalTaskRepository
+        return JournalTaskRepository()
+    if backend == "sqlite":
+        from repository.sqlite_task_repository import SqliteTaskRepository
+        return SqliteTaskRepository()
+    if backend == "json":
+        return TaskRepository()
+    raise ValueError(f"Unknown storage backend: {backend}")
\ No newline at end of file
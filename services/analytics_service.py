@@ -0,0 +1,233 @@
+import threading
+from datetime import date
+from typing import Dict, List, Optional
+from core.events import ChangeType, TaskChangeEvent
+from core.models import DailyStatistics, Priority, Task, TaskStatus
+from core.productivity import NUMPY_AVAILABLE, ProductivitySeries, productivity_series
+from core.task_table import TaskTable
+from repository.statistics_repository import StatisticsRepository
+from utils.metrics import get_logger
+
+logger = get_logger(__name__)
+
+# Скетчи выполненных задач (в часах): от создания до выполнения и опоздание относительно срока
+COMPLETION_HOURS = "completion_hours"
+DUE_SLIP_HOURS = "due_slip_hours"
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def _completed(task) -> int:
+    return 1 if task.status == TaskStatus.COMPLETED else 0
+
+
+def _priority_sketch(metric: str, priority: Priority) -> str:
+    return f"{metric}:priority:{priority.name.lower()}"
+
+
+def _month_sketch(metric: str, month: date) -> str:
+    return f"{metric}:month:{month:%Y-%m}"
+
+
+def _completion_samples(task: Task) -> List[tuple]:
+    """Значения скетчей выполненной задачи: [(имя скетча, часы)]; месяц - месяц выполнения"""
+    if task.status != TaskStatus.COMPLETED or task.completed_date is None:
+        return []
+    samples = []
+    for metric, hours in (
+            (COMPLETION_HOURS, (task.completed_date - task.created_date).total_seconds() / 3600),
+            (DUE_SLIP_HOURS, (task.completed_date - task.due_date).total_seconds() / 3600)):
+        samples.append((_priority_sketch(metric, task.priority), hours))
+        samples.append((_month_sketch(metric, task.completed_date), hours))
+    return samples
+
+
+class AnalyticsService:
+    """Статистика продуктивности, которая поддерживается по событиям TaskService.
+
+    Каждое изменение задачи меняет итоги, счетчики дня срока и скетчи квантилей
+    выполненных задач за O(1), поэтому экрану статистики не нужно загружать все задачи.
+    rebuild() пересчитывает все с нуля; события, пришедшие во время пересчета,
+    откладываются и учитываются после него.
+    """
+
+    def __init__(self, task_service, statistics_repository=None):
+        self.task_service = task_service
+        self.statistics_repository = statistics_repository or StatisticsRepository()
+        self._rebuild_lock = threading.RLock()
+        # События, пришедшие во время rebuild (None - перестройка не идет)
+        self._events_lock = threading.Lock()
+        self._buffered_events: Optional[List[TaskChangeEvent]] = None
+        # Колонки дат и статусов для рядов графика; строятся при первом запросе
+        self._table: Optional[TaskTable] = None
+        self._table_lock = threading.Lock()
+        task_service.events.subscribe(self._on_tasks_changed)
+
+    def _on_tasks_changed(self, events: List[TaskChangeEvent]):
+        """Применяет изменения задач к счетчикам и колонкам рядов"""
+        self._update_table(events)
+        with self._events_lock:
+            if self._buffered_events is not None:
+                # Идет перестройка: ее результат заменит счетчики, события применятся после
+                self._buffered_events.extend(events)
+                return
+            if not self.statistics_repository.is_loaded:
+                # Счетчики еще не построены: rebuild учтет и эти изменения
+                return
+            for event in events:
+                if event.type == ChangeType.CREATED:
+                    self._add_task(event.task, 1)
+                elif event.type == ChangeType.DELETED:
+                    self._add_task(event.task, -1)
+                else:
+                    self._add_task(event.previous, -1)
+                    self._add_task(event.task, 1)
+
+    def _add_task(self, task: Task, delta: int):
+        """Добавляет (delta=1) или вычитает (delta=-1) задачу в счетчиках и скетчах"""
+        self.statistics_repository.add(task.due_date.date(), delta, delta * _completed(task))
+        self._add_samples(task, delta)
+
+    def _add_samples(self, task: Task, delta: int):
+        """Добавляет (delta=1) или вычитает (delta=-1) значения выполненной задачи в скетчах"""
+        for name, hours in _completion_samples(task):
+            self.statistics_repository.add_sample(name, hours, delta)
+
+    def _update_table(self, events: List[TaskChangeEvent]):
+        """Переносит изменения задач в колонки рядов, если они уже построены"""
+        with self._table_lock:
+            if self._table is None:
+                return
+            for event in events:
+                if event.type == ChangeType.DELETED:
+                    if event.task.id in self._table:
+                        self._table.remove(event.task.id)
+                else:
+                    self._table.append(event.task)
+
+    @property
+    def is_built(self) -> bool:
+        """Построены ли счетчики (иначе первый запрос пересчитает их по всем задачам)"""
+        return self.statistics_repository.is_loaded
+
+    def _ensure_built(self):
+        """Строит счетчики по всем задачам, если файла статистики еще нет"""
+        if not self.statistics_repository.is_loaded:
+            with self._rebuild_lock:
+                if not self.statistics_repository.is_loaded:
+                    self.rebuild()
+
+    def rebuild(self):
+        """Полностью пересчитывает статистику по задачам (восстановление)"""
+        with self._rebuild_lock:
+            with self._events_lock:
+                self._buffered_events = []
+            try:
+                snapshot, days, sketches = self._count_all_tasks()
+            except Exception:
+                with self._events_lock:
+                    self._buffered_events = None
+                raise
+
+            with self._events_lock:
+                events, self._buffered_events = self._buffered_events, None
+                self.statistics_repository.replace_all(days, sketches)
+                self._apply_latest_states(events, snapshot)
+        logger.info("Статистика перестроена: задач %d, выполнено %d",
+                    self.statistics_repository.total_tasks,
+                    self.statistics_repository.completed_tasks)
+
+    def _count_all_tasks(self):
+        """Снимок задач {id: задача} и посчитанные по нему счетчики дней и скетчи"""
+        snapshot = {}
+        days = {}
+        sketches = {}
+        for task in self.task_service.task_repository.get_all_tasks():
+            snapshot[task.id] = task
+            counts = days.get(task.due_date.date())
+            if counts is None:
+                counts = days[task.due_date.date()] = [0, 0]
+            counts[0] += 1
+            counts[1] += _completed(task)
+            for name, hours in _completion_samples(task):
+                sketch = sketches.get(name)
+                if sketch is None:
+                    sketch = sketches[name] = StatisticsRepository.new_sketch()
+                sketch.add(hours)
+        return snapshot, days, sketches
+
+    def _apply_latest_states(self, events: List[TaskChangeEvent], snapshot: Dict[str, Task]):
+        """Приводит затронутые событиями задачи к состоянию из последнего события.
+
+        Событие могло попасть и в снимок, и в буфер, поэтому применяется не разница,
+        а замена: вклад задачи из снимка вычитается, вклад последнего состояния добавляется.
+        """
+        latest = {}
+        for event in events:
+            latest[event.task.id] = None if event.type == ChangeType.DELETED else event.task
+        for task_id, task in latest.items():
+            if task_id in snapshot:
+                self._add_task(snapshot[task_id], -1)
+            if task is not None:
+                self._add_task(task, 1)
+
+    def get_summary(self) -> dict:
+        """Итоги: всего задач, выполнено и процент выполненных"""
+        self._ensure_built()
+        repository = self.statistics_repository
+        total, completed = repository.total_tasks, repository.completed_tasks
+        return {
+            'total_tasks': total,
+            'completed_tasks': completed,
+            'productivity_percent': int(completed / total * 100) if total else 0,
+        }
+
+    def get_daily_statistics(self, start: date, end: date) -> List[DailyStatistics]:
+        """Статистика по дням срока start <= день < end"""
+        self._ensure_built()
+        return self.statistics_repository.get_days(start, end)
+
+    def get_completion_percentiles(self, priority: Priority = None,
+                                   month: date = None) -> Dict[str, object]:
+        """p50/p90/p99 времени выполнения и опоздания выполненных задач, в часах.
+
+        Выборка - задачи приоритета priority или выполненные в месяце month (любой день
+        месяца); без аргументов - все выполненные задачи. Ответ не зависит от числа задач:
+        запрос читает один скетч (или складывает три скетча приоритетов).
+        Возвращает {'count': n, COMPLETION_HOURS: {0.5: ч, ...}, DUE_SLIP_HOURS: {...}}.
+        """
+        if priority is not None and month is not None:
+            raise ValueError("Укажите priority или month, но не оба")
+        self._ensure_built()
+
+        result = {'count': 0}
+        for metric in (COMPLETION_HOURS, DUE_SLIP_HOURS):
+            if priority is not None:
+                names = [_priority_sketch(metric, priority)]
+            elif month is not None:
+                names = [_month_sketch(metric, month)]
+            else:
+                names = [_priority_sketch(metric, p) for p in Priority]
+            sketch = StatisticsRepository.new_sketch()
+            for name in names:
+                part = self.statistics_repository.get_sketch(name)
+                if part is not None:
+                    sketch.merge(part)
+            result['count'] = sketch.count
+            result[metric] = sketch.quantiles(PERCENTILES)
+        return result
+
+    def get_productivity_series(self, days: int = 30, end: date = None) -> Optional[ProductivitySeries]:
+        """Ряды продуктивности за days дней до end (по умолчанию - сегодня).
+
+        Возвращает None, если NumPy не установлен.
+        """
+        if not NUMPY_AVAILABLE:
+            return None
+        with self._table_lock:
+            if self._table is None:
+                self._table = TaskTable(self.task_service.task_repository.get_all_tasks())
+            return productivity_series(self._table, end or date.today(), days)
+
+    def flush(self):
+        """Сбрасывает отложенные изменения статистики на диск"""
+        self.statistics_repository.flush()
@@ -0,0 +1,87 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional
+from core.models import Priority
+from utils.metrics import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncTaskService:
+    """Асинхронная обертка над TaskService для экранов.
+
+    Работа с хранилищем идет в отдельном потоке ввода-вывода, методы сразу возвращают
+    Future, а результат (или ошибка) передается в колбэк через kivy Clock - то есть уже
+    в главном потоке интерфейса. Поток один, поэтому операции выполняются по порядку.
+    """
+
+    def __init__(self, task_service):
+        self.task_service = task_service
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-io")
+
+    def submit(self, func: Callable, *args, on_result: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, **kwargs) -> Future:
+        """Выполняет func в потоке ввода-вывода и возвращает Future"""
+        future = self._executor.submit(func, *args, **kwargs)
+        if on_result or on_error:
+            future.add_done_callback(lambda done: self._deliver(done, on_result, on_error))
+        return future
+
+    @staticmethod
+    def _deliver(future: Future, on_result: Optional[Callable], on_error: Optional[Callable]):
+        """Передает результат в главный поток Kivy"""
+        # Импорт здесь: сервисный слой не должен требовать Kivy без интерфейса
+        from kivy.clock import Clock
+
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                Clock.schedule_once(lambda dt: on_error(error), 0)
+            else:
+                logger.error("Ошибка фоновой операции: %s", error)
+        elif on_result:
+            result = future.result()
+            Clock.schedule_once(lambda dt: on_result(result), 0)
+
+    def get_all_tasks(self, on_result=None, on_error=None) -> Future:
+        """Получает все задачи"""
+        return self.submit(self.task_service.get_all_tasks,
+                           on_result=on_result, on_error=on_error)
+
+    def get_today_tasks(self, on_result=None, on_error=None) -> Future:
+        """Получает задачи на сегодня"""
+        return self.submit(self.task_service.get_today_tasks,
+                           on_result=on_result, on_error=on_error)
+
+    def get_tasks_in_range(self, start: datetime, end: datetime,
+                           on_result=None, on_error=None) -> Future:
+        """Получает задачи со сроком start <= due_date < end"""
+        return self.submit(self.task_service.get_tasks_in_range, start, end,
+                           on_result=on_result, on_error=on_error)
+
+    def create_task(self, title: str, description: str, priority: Priority, due_date: datetime,
+                    reminder_time: Optional[datetime] = None,
+                    on_result=None, on_error=None) -> Future:
+        """Создает новую задачу"""
+        return self.submit(self.task_service.create_task, title, description, priority,
+                           due_date, reminder_time, on_result=on_result, on_error=on_error)
+
+    def complete_task(self, task_id: str, on_result=None, on_error=None) -> Future:
+        """Отмечает задачу как выполненную"""
+        return self.submit(self.task_service.complete_task, task_id,
+                           on_result=on_result, on_error=on_error)
+
+    def update_task(self, task_id: str, on_result=None, on_error=None, **kwargs) -> Future:
+        """Обновляет задачу"""
+        return self.submit(self.task_service.update_task, task_id,
+                           on_result=on_result, on_error=on_error, **kwargs)
+
+    def delete_task(self, task_id: str, on_result=None, on_error=None) -> Future:
+        """Удаляет задачу"""
+        return self.submit(self.task_service.delete_task, task_id,
+                           on_result=on_result, on_error=on_error)
+
+    def shutdown(self):
+        """Дожидается фоновых операций и сбрасывает изменения на диск"""
+        self._executor.shutdown(wait=True)
+        self.task_service.flush()
@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from core.events import TaskChangeEvent
+from core.models import Task, TaskStatus
+from utils.config import CALENDAR_CACHE_MONTHS
+from utils.date_utils import month_bounds
+from utils.metrics import get_logger, metrics
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class MonthSummary:
+    """Задачи месяца по дням и сводка по каждому дню: сколько задач и сколько выполнено"""
+    year: int
+    month: int
+    tasks_by_day: Dict[int, List[Task]] = field(default_factory=dict)
+    completed_by_day: Dict[int, int] = field(default_factory=dict)
+
+    def task_count(self, day: int) -> int:
+        return len(self.tasks_by_day.get(day, ()))
+
+    def completed_count(self, day: int) -> int:
+        return self.completed_by_day.get(day, 0)
+
+    def add_task(self, task: Task):
+        """Добавляет задачу в день ее срока"""
+        day = task.due_date.day
+        self.tasks_by_day.setdefault(day, []).append(task)
+        if task.status == TaskStatus.COMPLETED:
+            self.completed_by_day[day] = self.completed_by_day.get(day, 0) + 1
+
+    def remove_task(self, task_id: str, day: int) -> bool:
+        """Убирает задачу из дня; False, если ее там не было"""
+        tasks = self.tasks_by_day.get(day, [])
+        for index, task in enumerate(tasks):
+            if task.id == task_id:
+                del tasks[index]
+                if task.status == TaskStatus.COMPLETED:
+                    self.completed_by_day[day] -= 1
+                return True
+        return False
+
+    def copy(self) -> 'MonthSummary':
+        """Копия, которую можно менять, не трогая кэш"""
+        return MonthSummary(self.year, self.month,
+                            {day: list(tasks) for day, tasks in self.tasks_by_day.items()},
+                            dict(self.completed_by_day))
+
+
+class CalendarService:
+    """Сводки месяцев для календаря с LRU-кэшем на CALENDAR_CACHE_MONTHS месяцев.
+
+    Месяц считается одним запросом диапазона и кэшируется по (год, месяц); изменение
+    задачи выбрасывает из кэша месяцы старой и новой даты срока. get_month вызывается
+    в потоке ввода-вывода, peek - в главном (только читает кэш).
+    """
+
+    def __init__(self, task_service, capacity: int = CALENDAR_CACHE_MONTHS):
+        self.task_service = task_service
+        self.capacity = capacity
+        self._cache: "OrderedDict[Tuple[int, int], MonthSummary]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Растет при каждой инвалидации: сводка, посчитанная до нее, в кэш не попадает
+        self._version = 0
+        task_service.events.subscribe(self._on_tasks_changed)
+
+    def _on_tasks_changed(self, events: List[TaskChangeEvent]):
+        """Выбрасывает из кэша месяцы, которых касаются изменения"""
+        months = {(day.year, day.month) for event in events for day in event.affected_dates()}
+        with self._lock:
+            self._version += 1
+            for key in months:
+                self._cache.pop(key, None)
+
+    def peek(self, year: int, month: int) -> Optional[MonthSummary]:
+        """Сводка месяца из кэша или None (без обращения к хранилищу)"""
+        with self._lock:
+            summary = self._cache.get((year, month))
+            if summary is not None:
+                self._cache.move_to_end((year, month))
+            return summary
+
+    def get_month(self, year: int, month: int) -> MonthSummary:
+        """Сводка месяца: из кэша или одним запросом задач месяца"""
+        summary = self.peek(year, month)
+        if summary is not None:
+            metrics.increment("CalendarService.cache_hits")
+            return summary
+
+        metrics.increment("CalendarService.cache_misses")
+        with self._lock:
+            version = self._version
+        start, end = month_bounds(year, month)
+        summary = MonthSummary(year, month)
+        for task in self.task_service.get_tasks_in_range(start, end):
+            summary.add_task(task)
+
+        with self._lock:
+            # Пока месяц считался, задачи могли измениться: такую сводку не кэшируем
+            if version == self._version:
+                self._cache[(year, month)] = summary
+                self._cache.move_to_end((year, month))
+                while len(self._cache) > self.capacity:
+                    self._cache.popitem(last=False)
+        return summary
+
+    def is_cached(self, year: int, month: int) -> bool:
+        with self._lock:
+            return (year, month) in self._cache
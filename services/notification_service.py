@@ -1,46 +1,168 @@
 from datetime import datetime
-from core.models import Task
-from plyer import notification
+from typing import Iterable, Tuple
+from core.models import Task, TaskStatus
+from utils.notification_utils import NotificationDispatcher
+from utils.metrics import get_logger
+import heapq
+import itertools
 import threading
-import time
+
+logger = get_logger(__name__)
 
 
 class NotificationService:
-    def __init__(self):
+    """Планировщик напоминаний: один поток и min-heap (время срабатывания, задача)"""
+
+    # Поток не спит дольше этого: так замечаются переводы часов и выход из сна системы
+    MAX_SLEEP_SECONDS = 30
+
+    def __init__(self, dispatcher=None):
+        # task_id -> (время срабатывания, номер записи, задача); номер отличает
+        # актуальную запись кучи от устаревших после отмены или переноса
         self.scheduled_reminders = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        # task_id -> Task для напоминаний, запланированных без объекта задачи
+        self.task_resolver = None
+        # Вызывается со списком id задач, уведомления которых показаны или больше не нужны
+        self.on_delivered = None
+        # Показ уведомлений идет в пуле потоков доставки, а не в потоке планировщика
+        self.dispatcher = dispatcher or NotificationDispatcher()
+        self.dispatcher.on_delivered = self._report_delivered
 
     def schedule_reminder(self, task: Task):
         """Планирует напоминание для задачи"""
-        if not task.reminder_time:
-            return
+        self.schedule_reminders([task])
 
-        reminder_id = f"task_{task.id}"
+    def schedule_reminders(self, tasks: Iterable[Task]):
+        """Планирует напоминания для нескольких задач"""
+        now = datetime.now()
+        with self._condition:
+            for task in tasks:
+                if not task.reminder_time:
+                    continue
 
-        # Отменяем существующее напоминание
-        self.cancel_reminder(task.id)
+                # Отменяем существующее напоминание
+                self.scheduled_reminders.pop(task.id, None)
 
-        # Вычисляем задержку до напоминания
-        now = datetime.now()
-        delay = (task.reminder_time - now).total_seconds()
-
-        if delay > 0:
-            timer = threading.Timer(delay, self._show_notification, [task])
-            timer.start()
-            self.scheduled_reminders[task.id] = timer
-
-    def _show_notification(self, task: Task):
-        """Показывает уведомление"""
-        try:
-            notification.notify(
-                title=f"Напоминание: {task.title}",
-                message=f"Срок выполнения: {task.due_date.strftime('%H:%M')}",
-                timeout=10
-            )
-        except Exception as e:
-            print(f"Ошибка показа уведомления: {e}")
+                if task.reminder_time > now:
+                    sequence = next(self._sequence)
+                    self.scheduled_reminders[task.id] = (task.reminder_time, sequence, task)
+                    heapq.heappush(self._heap, (task.reminder_time, sequence, task.id))
+
+            self._ensure_thread()
+            self._condition.notify()
+
+    def schedule_at(self, entries: Iterable[Tuple[str, datetime]]):
+        """Планирует напоминания по (task_id, время) без загрузки задач.
+
+        Задача получается через task_resolver в момент срабатывания; прошедшее
+        время срабатывает сразу.
+        """
+        with self._condition:
+            for task_id, fire_time in entries:
+                sequence = next(self._sequence)
+                self.scheduled_reminders[task_id] = (fire_time, sequence, None)
+                heapq.heappush(self._heap, (fire_time, sequence, task_id))
+
+            self._ensure_thread()
+            self._condition.notify()
 
     def cancel_reminder(self, task_id: str):
         """Отменяет запланированное напоминание"""
-        if task_id in self.scheduled_reminders:
-            self.scheduled_reminders[task_id].cancel()
-            del self.scheduled_reminders[task_id]
\ No newline at end of file
+        self.cancel_reminders([task_id])
+
+    def cancel_reminders(self, task_ids: Iterable[str]):
+        """Отменяет напоминания для нескольких задач"""
+        with self._condition:
+            for task_id in task_ids:
+                # Запись в куче остается и будет пропущена (ленивое удаление)
+                self.scheduled_reminders.pop(task_id, None)
+            self._compact_heap()
+
+    def _compact_heap(self):
+        """Перестраивает кучу, когда устаревших записей в ней больше половины"""
+        if len(self._heap) > 2 * len(self.scheduled_reminders) + 64:
+            self._heap = [(fire_time, sequence, task_id)
+                          for task_id, (fire_time, sequence, _) in self.scheduled_reminders.items()]
+            heapq.heapify(self._heap)
+
+    def _is_current(self, entry) -> bool:
+        """Проверяет, что запись кучи не отменена и не перенесена"""
+        scheduled = self.scheduled_reminders.get(entry[2])
+        return scheduled is not None and scheduled[1] == entry[1]
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+            self._thread.start()
+
+    def _pop_due(self):
+        """Ждет ближайшее напоминание и возвращает наступившие (task_id, задача, время)"""
+        with self._condition:
+            while True:
+                while self._heap and not self._is_current(self._heap[0]):
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                # Сравниваем с настенными часами при каждом пробуждении
+                now = datetime.now()
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    entry = heapq.heappop(self._heap)
+                    if self._is_current(entry):
+                        task = self.scheduled_reminders.pop(entry[2])[2]
+                        due.append((entry[2], task, entry[0]))
+                if due:
+                    return due
+                if not self._heap:
+                    continue
+
+                delay = (self._heap[0][0] - now).total_seconds()
+                self._condition.wait(min(delay, self.MAX_SLEEP_SECONDS))
+
+    def _resolve(self, task_id: str, task):
+        """Находит задачу для напоминания, запланированного только по id"""
+        if task is None and self.task_resolver is not None:
+            try:
+                task = self.task_resolver(task_id)
+            except Exception as e:
+                logger.warning("Задача напоминания не найдена: %s", e)
+                return None
+        # Напоминания по выполненным задачам больше не нужны
+        if task is None or task.status == TaskStatus.COMPLETED:
+            return None
+        return task
+
+    def _report_delivered(self, task_ids):
+        if self.on_delivered is not None and task_ids:
+            try:
+                self.on_delivered(task_ids)
+            except Exception as e:
+                logger.error("Ошибка сохранения отправленных напоминаний: %s", e)
+
+    def _run(self):
+        while True:
+            skipped = []
+            by_fire_time = {}
+            for task_id, task, fire_time in self._pop_due():
+                task = self._resolve(task_id, task)
+                if task is not None:
+                    by_fire_time.setdefault(fire_time, []).append(task)
+                else:
+                    # Задачи нет или она выполнена: напоминание больше не нужно
+                    skipped.append(task_id)
+            # Показанные отмечает поток доставки; отброшенные, не показанные из-за ошибки
+            # и не дождавшиеся показа до выхода придут как пропущенные при следующем запуске
+            for fire_time, tasks in by_fire_time.items():
+                self.dispatcher.submit(tasks, fire_time)
+            self._report_delivered(skipped)
+
+    def delivery_stats(self) -> dict:
+        """Счетчики доставки уведомлений (отправлено, объединено, отброшено, задержка)"""
+        return self.dispatcher.stats()
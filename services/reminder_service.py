@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import Iterable, List
+from core.models import Reminder, Task
+from repository.reminder_repository import ReminderRepository
+from utils.metrics import get_logger
+
+logger = get_logger(__name__)
+
+
+class ReminderService:
+    """Сохраняет напоминания на диск и передает их в NotificationService.
+
+    Интерфейс планирования тот же, что у NotificationService, так что TaskService
+    работает с ним так же, как раньше напрямую с уведомлениями.
+    """
+
+    def __init__(self, notification_service, reminder_repository=None, task_resolver=None):
+        self.notification_service = notification_service
+        self.reminder_repository = reminder_repository or ReminderRepository()
+        self.notification_service.task_resolver = task_resolver
+        self.notification_service.on_delivered = self.reminder_repository.mark_sent
+
+    def restore(self):
+        """Перепланирует неотправленные напоминания после запуска.
+
+        Читается только файл напоминаний: задачи загружаются в момент срабатывания.
+        Пропущенные, пока приложение было закрыто, напоминания показываются один раз;
+        отправленными они отмечаются только после показа, так что не показанные из-за
+        ошибки или выхода напоминания снова окажутся среди пропущенных.
+        """
+        now = datetime.now()
+        missed = self.reminder_repository.get_missed(now)
+        upcoming = self.reminder_repository.get_pending_after(now)
+        self.notification_service.schedule_at(
+            (reminder.task_id, reminder.reminder_time) for reminder in missed + upcoming)
+        logger.info("Напоминаний восстановлено: %d, пропущенных: %d", len(upcoming), len(missed))
+
+    def schedule_reminder(self, task: Task):
+        """Сохраняет и планирует напоминание для задачи"""
+        self.schedule_reminders([task])
+
+    def schedule_reminders(self, tasks: Iterable[Task]):
+        """Сохраняет и планирует напоминания для нескольких задач"""
+        now = datetime.now()
+        tasks = [task for task in tasks if task.reminder_time]
+        upcoming: List[Task] = [task for task in tasks if task.reminder_time > now]
+
+        # Прошедшее время не планируется, старая запись такой задачи удаляется
+        self.reminder_repository.delete_for_tasks(
+            [task.id for task in tasks if task.reminder_time <= now])
+        if upcoming:
+            self.reminder_repository.save_reminders([
+                Reminder(id=f"task_{task.id}", task_id=task.id, reminder_time=task.reminder_time)
+                for task in upcoming
+            ])
+        self.notification_service.schedule_reminders(tasks)
+
+    def cancel_reminder(self, task_id: str):
+        """Отменяет и удаляет напоминание задачи"""
+        self.cancel_reminders([task_id])
+
+    def cancel_reminders(self, task_ids: Iterable[str]):
+        """Отменяет и удаляет напоминания нескольких задач"""
+        task_ids = list(task_ids)
+        self.reminder_repository.delete_for_tasks(task_ids)
+        self.notification_service.cancel_reminders(task_ids)
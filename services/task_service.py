@@ -1,27 +1,39 @@
+import copy
+import logging
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from core.models import Task, TaskStatus, Priority
-from repository.task_repository import TaskRepository
+from core.events import ChangeType, TaskChangeEvent, TaskEventBus
+from repository.task_repository import create_task_repository
 from services.notification_service import NotificationService
+from services.reminder_service import ReminderService
 from core.exceptions import InvalidTaskDataException
+from utils.date_utils import month_bounds
+from utils.metrics import get_logger, instrumented
 
+logger = get_logger(__name__)
 
+
+@instrumented()
 class TaskService:
-    def __init__(self):
-        self.task_repository = TaskRepository()
-        self.notification_service = NotificationService()
-        print("TaskService инициализирован")
+    def __init__(self, task_repository=None, notification_service=None, reminder_service=None):
+        self.task_repository = task_repository or create_task_repository()
+        self.notification_service = notification_service or NotificationService()
+        # Напоминания сохраняются на диск и планируются через NotificationService
+        self.reminder_service = reminder_service or ReminderService(
+            self.notification_service, task_resolver=self.task_repository.get_task)
+        # Экраны подписываются на изменения задач, чтобы не перечитывать все при входе
+        self.events = TaskEventBus()
+        logger.info("TaskService инициализирован")
 
-    def create_task(self, title: str, description: str, priority: Priority, due_date: datetime,
+    def _build_task(self, title: str, description: str, priority: Priority, due_date: datetime,
                     reminder_time: Optional[datetime] = None) -> Task:
-        """Создает новую задачу"""
-        print(f"Создание задачи: {title}, дата: {due_date}")
-
+        """Проверяет данные и создает объект новой задачи"""
         if not title or not title.strip():
             raise InvalidTaskDataException("Title cannot be empty")
 
-        task = Task(
+        return Task(
             id=str(uuid.uuid4()),
             title=title.strip(),
             description=description.strip(),
@@ -32,63 +44,187 @@ class TaskService:
             reminder_time=reminder_time
         )
 
+    def create_task(self, title: str, description: str, priority: Priority, due_date: datetime,
+                    reminder_time: Optional[datetime] = None) -> Task:
+        """Создает новую задачу"""
+        logger.debug("Создание задачи: %s, дата: %s", title, due_date)
+
+        task = self._build_task(title, description, priority, due_date, reminder_time)
+
         self.task_repository.add_task(task)
-        print(f"Задача сохранена в репозиторий: {task.title}")
+        logger.info("Задача сохранена в репозиторий: %s", task.title)
 
         # Планируем напоминание если указано
         if reminder_time:
-            self.notification_service.schedule_reminder(task)
+            self.reminder_service.schedule_reminder(task)
 
+        self.events.publish([TaskChangeEvent(ChangeType.CREATED, task)])
         return task
 
+    def create_tasks(self, tasks_data: Iterable[dict]) -> List[Task]:
+        """Создает несколько задач за одну запись в хранилище.
+
+        Каждый элемент - словарь с аргументами create_task.
+        """
+        # Сначала проверяем все задачи, чтобы не сохранить пачку наполовину
+        tasks = [self._build_task(**task_data) for task_data in tasks_data]
+
+        with self.task_repository.transaction():
+            for task in tasks:
+                self.task_repository.add_task(task)
+
+        self.reminder_service.schedule_reminders([task for task in tasks if task.reminder_time])
+        self.events.publish([TaskChangeEvent(ChangeType.CREATED, task) for task in tasks])
+        logger.info("Создано задач: %d", len(tasks))
+        return tasks
+
     def get_all_tasks(self) -> List[Task]:
         """Получает все задачи"""
         tasks = self.task_repository.get_all_tasks()
-        print(f"Загружено задач из репозитория: {len(tasks)}")
+        logger.debug("Загружено задач из репозитория: %d", len(tasks))
         return tasks
 
     def get_today_tasks(self) -> List[Task]:
-        """Получает задачи на сегодня"""
-        today = datetime.now().date()
-        all_tasks = self.get_all_tasks()
-        today_tasks = [task for task in all_tasks if
-                      task.due_date.date() == today and
-                      task.status != TaskStatus.COMPLETED]
-        print(f"Задачи на сегодня: {len(today_tasks)}")
-        for task in today_tasks:
-            print(f"  - {task.title} (статус: {task.status.value}, дата: {task.due_date.date()})")
+        """Получает невыполненные задачи на сегодня (по индексу дат, без копии всех задач)"""
+        today_tasks = [task for task in self.task_repository.get_tasks_by_date(datetime.now())
+                       if task.status != TaskStatus.COMPLETED]
+        logger.debug("Задачи на сегодня: %d", len(today_tasks))
+        # Построчный список нужен только при отладке: не форматируем его зря
+        if logger.isEnabledFor(logging.DEBUG):
+            for task in today_tasks:
+                logger.debug("  - %s (статус: %s, дата: %s)",
+                             task.title, task.status.value, task.due_date.date())
         return today_tasks
 
-    def complete_task(self, task_id: str):
-        """Отмечает задачу как выполненную"""
+    def complete_task(self, task_id: str) -> Optional[Task]:
+        """Отмечает задачу как выполненную; возвращает ее или None, если задачи нет"""
         task = self.task_repository.get_task(task_id)
         if task:
+            previous = copy.copy(task)
             task.status = TaskStatus.COMPLETED
             task.completed_date = datetime.now()
             self.task_repository.update_task(task)
 
             # Отменяем напоминание для выполненной задачи
-            self.notification_service.cancel_reminder(task_id)
-            print(f"Задача выполнена: {task.title}")
+            self.reminder_service.cancel_reminder(task_id)
+            self.events.publish([TaskChangeEvent(ChangeType.COMPLETED, task, previous)])
+            logger.info("Задача выполнена: %s", task.title)
+        return task
 
-    def update_task(self, task_id: str, **kwargs):
-        """Обновляет задачу"""
+    def update_task(self, task_id: str, **kwargs) -> Optional[Task]:
+        """Обновляет задачу; возвращает ее или None, если задачи нет"""
         task = self.task_repository.get_task(task_id)
         if task:
+            previous = copy.copy(task)
             for key, value in kwargs.items():
                 if hasattr(task, key):
                     setattr(task, key, value)
             self.task_repository.update_task(task)
+            self.events.publish([TaskChangeEvent(ChangeType.UPDATED, task, previous)])
+        return task
 
     def delete_task(self, task_id: str):
         """Удаляет задачу"""
-        self.notification_service.cancel_reminder(task_id)
+        task = self.task_repository.get_task(task_id)
+        self.reminder_service.cancel_reminder(task_id)
         self.task_repository.delete_task(task_id)
+        if task:
+            self.events.publish([TaskChangeEvent(ChangeType.DELETED, task)])
+
+    def complete_tasks(self, task_ids: Iterable[str]) -> List[Task]:
+        """Отмечает несколько задач выполненными за одну запись в хранилище.
+
+        Отсутствующие id пропускаются; возвращает выполненные задачи.
+        """
+        completed = []
+        events = []
+        now = datetime.now()
+        with self.task_repository.transaction():
+            for task_id in task_ids:
+                task = self.task_repository.get_task(task_id)
+                if task:
+                    previous = copy.copy(task)
+                    task.status = TaskStatus.COMPLETED
+                    task.completed_date = now
+                    self.task_repository.update_task(task)
+                    completed.append(task)
+                    events.append(TaskChangeEvent(ChangeType.COMPLETED, task, previous))
+
+        self.reminder_service.cancel_reminders([task.id for task in completed])
+        self.events.publish(events)
+        logger.info("Выполнено задач: %d", len(completed))
+        return completed
+
+    def update_tasks(self, changes: Dict[str, dict]) -> List[Task]:
+        """Обновляет несколько задач за одну запись: {id: {поле: значение}}.
+
+        Отсутствующие id пропускаются; возвращает обновленные задачи.
+        """
+        updated = []
+        events = []
+        with self.task_repository.transaction():
+            for task_id, task_changes in changes.items():
+                task = self.task_repository.get_task(task_id)
+                if task:
+                    previous = copy.copy(task)
+                    for key, value in task_changes.items():
+                        if hasattr(task, key):
+                            setattr(task, key, value)
+                    self.task_repository.update_task(task)
+                    updated.append(task)
+                    events.append(TaskChangeEvent(ChangeType.UPDATED, task, previous))
+
+        # Перепланируем напоминания только там, где менялось их время
+        rescheduled = [task for task in updated if 'reminder_time' in changes[task.id]]
+        self.reminder_service.cancel_reminders(
+            [task.id for task in rescheduled if not task.reminder_time])
+        self.reminder_service.schedule_reminders(
+            [task for task in rescheduled if task.reminder_time])
+        self.events.publish(events)
+        return updated
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> List[Task]:
+        """Удаляет несколько задач за одну запись в хранилище.
+
+        Отсутствующие id пропускаются, как в complete_tasks и update_tasks, а не откатывают
+        всю пачку; возвращает удаленные задачи.
+        """
+        task_ids = list(task_ids)
+        deleted = []
+        with self.task_repository.transaction():
+            for task_id in task_ids:
+                task = self.task_repository.get_task(task_id)
+                if task:
+                    self.task_repository.delete_task(task_id)
+                    deleted.append(task)
+
+        self.reminder_service.cancel_reminders(task_ids)
+        self.events.publish([TaskChangeEvent(ChangeType.DELETED, task) for task in deleted])
+        return deleted
+
+    def restore_reminders(self):
+        """Перепланирует сохраненные напоминания (вызывается при запуске приложения)"""
+        self.reminder_service.restore()
+
+    def flush(self):
+        """Сбрасывает отложенные изменения хранилища на диск"""
+        self.task_repository.flush()
 
     def get_tasks_by_date(self, date: datetime) -> List[Task]:
         """Получает задачи на определенную дату"""
         tasks = self.task_repository.get_tasks_by_date(date)
-        print(f"Задачи на {date.date()}: {len(tasks)}")
-        for task in tasks:
-            print(f"  - {task.title} (статус: {task.status.value})")
-        return tasks
\ No newline at end of file
+        logger.debug("Задачи на %s: %d", date.date(), len(tasks))
+        if logger.isEnabledFor(logging.DEBUG):
+            for task in tasks:
+                logger.debug("  - %s (статус: %s)", task.title, task.status.value)
+        return tasks
+
+    def get_tasks_in_range(self, start: datetime, end: datetime) -> List[Task]:
+        """Получает задачи со сроком start <= due_date < end за одно чтение"""
+        return self.task_repository.get_tasks_in_range(start, end)
+
+    def get_task_counts_by_day(self, year: int, month: int) -> Dict[int, int]:
+        """Возвращает количество задач по дням месяца: {день: количество}"""
+        start, end = month_bounds(year, month)
+        counts = self.task_repository.count_tasks_by_day(start, end)
+        return {day.day: count for day, count in counts.items()}
\ No newline at end of file
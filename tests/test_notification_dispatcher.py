@@ -0,0 +1,233 @@
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from core.models import Priority, Task, TaskStatus
+from repository.reminder_repository import ReminderRepository
+from services.notification_service import NotificationService
+from services.reminder_service import ReminderService
+from utils.notification_utils import NotificationDispatcher, RateLimiter
+
+WINDOW_START = datetime(2026, 1, 1, 9, 0)
+
+
+def make_task(task_id: str, reminder_time=None) -> Task:
+    return Task(id=task_id, title=f"Задача {task_id}", description="",
+                priority=Priority.MEDIUM, status=TaskStatus.PENDING,
+                due_date=WINDOW_START, created_date=WINDOW_START,
+                reminder_time=reminder_time)
+
+
+def wait_until(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "условие не выполнилось за отведенное время"
+        time.sleep(0.005)
+
+
+class FakeNotifier:
+    """Запоминает показанные уведомления; при fail=True падает на каждом показе"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.shown = []
+
+    def notify(self, title: str, message: str, timeout: int = 10):
+        if self.fail:
+            raise RuntimeError("уведомления недоступны")
+        self.shown.append((title, message))
+
+
+class GatedRateLimiter:
+    """Ограничитель, который не пропускает уведомления до вызова open()"""
+
+    def __init__(self):
+        self.waiting = threading.Event()
+        self._gate = threading.Event()
+
+    def acquire(self):
+        self.waiting.set()
+        self._gate.wait()
+
+    def open(self):
+        self._gate.set()
+
+
+def make_dispatcher(notifier, rate_limiter=None, queue_size: int = 10):
+    return NotificationDispatcher(notifier=notifier, workers=1, queue_size=queue_size,
+                                  coalesce_seconds=60,
+                                  rate_limiter=rate_limiter or RateLimiter(1000, 1000))
+
+
+def test_tasks_of_one_window_are_coalesced():
+    notifier = FakeNotifier()
+    dispatcher = make_dispatcher(notifier)
+
+    accepted = dispatcher.submit([make_task("a"), make_task("b"), make_task("c")], WINDOW_START)
+    wait_until(lambda: dispatcher.stats()['delivered'] == 1)
+
+    assert accepted == ["a", "b", "c"]
+    assert notifier.shown == [("Задач к 09:00: 3", "Задача a, Задача b, Задача c")]
+    stats = dispatcher.stats()
+    assert stats['submitted'] == 3
+    assert stats['coalesced'] == 2
+
+
+def test_later_submit_joins_queued_notification_of_same_window():
+    notifier = FakeNotifier()
+    limiter = GatedRateLimiter()
+    dispatcher = make_dispatcher(notifier, limiter)
+
+    dispatcher.submit([make_task("a")], WINDOW_START)
+    dispatcher.submit([make_task("b")], WINDOW_START + timedelta(seconds=30))
+    dispatcher.submit([make_task("c")], WINDOW_START + timedelta(minutes=5))
+    limiter.open()
+    wait_until(lambda: dispatcher.stats()['delivered'] == 2)
+
+    assert [title for title, _ in notifier.shown] == ["Задач к 09:00: 2", "Напоминание: Задача c"]
+    assert dispatcher.stats()['coalesced'] == 1
+
+
+def test_rate_limiter_allows_burst_then_waits_for_tokens():
+    limiter = RateLimiter(rate=20, burst=2)
+
+    started = time.monotonic()
+    limiter.acquire()
+    limiter.acquire()
+    burst_elapsed = time.monotonic() - started
+    limiter.acquire()
+    limiter.acquire()
+    total_elapsed = time.monotonic() - started
+
+    assert burst_elapsed < 0.05
+    # После burst каждый токен ждет 1 / rate = 0.05 с
+    assert total_elapsed >= 0.09
+
+
+def test_full_queue_drops_notification_and_does_not_accept_it():
+    notifier = FakeNotifier()
+    limiter = GatedRateLimiter()
+    dispatcher = make_dispatcher(notifier, limiter, queue_size=1)
+
+    assert dispatcher.submit([make_task("a")], WINDOW_START) == ["a"]
+    # Первое уведомление уже у потока доставки, второе занимает единственное место в очереди
+    assert limiter.waiting.wait(2.0)
+    assert dispatcher.submit([make_task("b")], WINDOW_START + timedelta(minutes=5)) == ["b"]
+    assert dispatcher.submit([make_task("c")], WINDOW_START + timedelta(minutes=10)) == []
+
+    limiter.open()
+    wait_until(lambda: dispatcher.stats()['delivered'] == 2)
+    stats = dispatcher.stats()
+    assert stats['dropped'] == 1
+    assert stats['submitted'] == 3
+    assert [title for title, _ in notifier.shown] == ["Напоминание: Задача a", "Напоминание: Задача b"]
+
+
+def test_notifier_error_is_counted_as_failed():
+    dispatcher = make_dispatcher(FakeNotifier(fail=True))
+
+    dispatcher.submit([make_task("a")], WINDOW_START)
+    dispatcher.submit([make_task("b")], WINDOW_START + timedelta(minutes=5))
+    wait_until(lambda: dispatcher.stats()['failed'] == 2)
+
+    stats = dispatcher.stats()
+    assert stats['delivered'] == 0
+    assert stats['latency_max'] == 0.0
+
+
+def test_failed_reminder_stays_pending(tmp_path):
+    notification_service = NotificationService(dispatcher=make_dispatcher(FakeNotifier(fail=True)))
+    reminders = ReminderRepository(str(tmp_path / "reminders.json"))
+    task = make_task("a", datetime.now() + timedelta(milliseconds=50))
+    service = ReminderService(notification_service, reminders, task_resolver={"a": task}.get)
+
+    service.schedule_reminders([task])
+    wait_until(lambda: notification_service.delivery_stats()['failed'] == 1)
+    time.sleep(0.05)
+
+    assert not reminders.get_reminder("a").is_sent
+    # При следующем запуске restore() покажет его как пропущенное
+    restored = ReminderRepository(str(tmp_path / "reminders.json"))
+    assert [reminder.task_id for reminder in restored.get_missed(datetime.now())] == ["a"]
+
+
+def test_shown_reminder_is_removed_from_file(tmp_path):
+    notification_service = NotificationService(dispatcher=make_dispatcher(FakeNotifier()))
+    reminders = ReminderRepository(str(tmp_path / "reminders.json"))
+    task = make_task("a", datetime.now() + timedelta(milliseconds=50))
+    service = ReminderService(notification_service, reminders, task_resolver={"a": task}.get)
+
+    service.schedule_reminders([task])
+    wait_until(lambda: reminders.get_reminder("a") is None)
+
+    assert ReminderRepository(str(tmp_path / "reminders.json")).get_reminder("a") is None
+
+
+def collect_delivered(service: NotificationService) -> list:
+    delivered = []
+    lock = threading.Lock()
+
+    def on_delivered(task_ids):
+        with lock:
+            delivered.extend(task_ids)
+
+    service.on_delivered = on_delivered
+    return delivered
+
+
+def test_on_delivered_reports_each_reminder_once():
+    notifier = FakeNotifier()
+    service = NotificationService(dispatcher=make_dispatcher(notifier))
+    delivered = collect_delivered(service)
+    completed = make_task("done")
+    completed.status = TaskStatus.COMPLETED
+    service.task_resolver = {"done": completed}.get
+
+    soon = datetime.now() + timedelta(milliseconds=100)
+    service.schedule_reminders([make_task("a", soon), make_task("b", soon),
+                                make_task("c", soon + timedelta(milliseconds=50))])
+    # Напоминание по выполненной задаче и по удаленной: показывать нечего, но отметить нужно
+    service.schedule_at([("done", soon), ("missing", soon)])
+    wait_until(lambda: len(delivered) >= 5)
+    time.sleep(0.1)
+
+    assert Counter(delivered) == Counter({"a": 1, "b": 1, "c": 1, "done": 1, "missing": 1})
+    assert service.delivery_stats()['submitted'] == 3
+
+
+def test_reminders_are_reported_only_after_they_are_shown():
+    limiter = GatedRateLimiter()
+    service = NotificationService(dispatcher=make_dispatcher(FakeNotifier(), limiter))
+    delivered = collect_delivered(service)
+    tasks = {task_id: make_task(task_id) for task_id in ("a", "b")}
+    service.task_resolver = tasks.get
+
+    # Оба напоминания попадают в одно окно и показываются одним уведомлением
+    service.schedule_at([("a", WINDOW_START), ("b", WINDOW_START)])
+    wait_until(lambda: service.delivery_stats()['submitted'] == 2)
+    assert limiter.waiting.wait(2.0)
+    assert delivered == []
+
+    limiter.open()
+    wait_until(lambda: len(delivered) == 2)
+    assert sorted(delivered) == ["a", "b"]
+
+
+def test_dropped_reminders_are_not_reported_as_delivered():
+    limiter = GatedRateLimiter()
+    service = NotificationService(dispatcher=make_dispatcher(FakeNotifier(), limiter, queue_size=1))
+    delivered = collect_delivered(service)
+    tasks = {task_id: make_task(task_id) for task_id in ("a", "b", "c")}
+    service.task_resolver = tasks.get
+
+    past = datetime.now() - timedelta(hours=1)
+    service.schedule_at((task_id, past + timedelta(minutes=5 * number))
+                        for number, task_id in enumerate(tasks))
+    wait_until(lambda: service.delivery_stats()['submitted'] == 3)
+    limiter.open()
+    wait_until(lambda: len(delivered) + service.delivery_stats()['dropped'] == 3)
+    time.sleep(0.05)
+
+    stats = service.delivery_stats()
+    assert stats['dropped'] >= 1
+    assert len(set(delivered)) == len(delivered) == 3 - stats['dropped']
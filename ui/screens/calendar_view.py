@@ -1,9 +1,14 @@
 from kivy.uix.screenmanager import Screen
+from kivy.uix.button import Button
 from kivy.lang import Builder
 from kivy.properties import StringProperty, ObjectProperty, NumericProperty
 from kivy.clock import Clock
 from kivy.metrics import dp
 from datetime import datetime, timedelta
+from services.async_task_service import AsyncTaskService
+from services.calendar_service import CalendarService, MonthSummary
+from core.events import ChangeType
+from utils.metrics import get_logger
 import os
 
 # Загружаем KV-файл
@@ -11,14 +16,45 @@ kv_path = os.path.join(os.path.dirname(__file__), '..', 'kv', 'calendar_view.kv'
 if os.path.exists(kv_path):
     Builder.load_file(kv_path)
 
+logger = get_logger(__name__)
 
-class CalendarDayButton:
-    """Простой класс для создания дней календаря с гарантированным отображением цифр"""
 
-    @staticmethod
-    def create(day, is_today=False, is_selected=False, is_weekend=False, task_count=0, on_press_callback=None):
-        from kivy.uix.button import Button
+class CalendarDayButton(Button):
+    """Ячейка дня из постоянного пула сетки календаря.
+
+    Ячейки создаются один раз; при смене месяца и выборе дня меняются только
+    текст и цвета. day == 0 - пустая ячейка до начала или после конца месяца.
+    """
 
+    day = NumericProperty(0)
+
+    def __init__(self, on_day_pressed, **kwargs):
+        super().__init__(
+            size_hint_y=None,
+            height=dp(60),
+            background_normal='',
+            font_size='18sp',
+            bold=True,
+            halign='center',
+            valign='middle',
+            **kwargs
+        )
+        self._on_day_pressed = on_day_pressed
+        self.show_blank()
+
+    def on_press(self):
+        if self.day:
+            self._on_day_pressed(self.day)
+
+    def show_blank(self):
+        """Делает ячейку пустой и невидимой"""
+        self.day = 0
+        self.text = ""
+        self.background_color = (0, 0, 0, 0)
+
+    def show_day(self, day, is_today=False, is_selected=False, is_weekend=False, task_count=0,
+                 completed_count=0):
+        """Показывает в ячейке день месяца"""
         # Базовые цвета
         if is_selected:
             bg_color = (0.2, 0.6, 1, 1)  # Синий
@@ -33,37 +69,22 @@ class CalendarDayButton:
             bg_color = (1, 1, 1, 1)  # Белый
             text_color = (0.1, 0.1, 0.1, 1)  # Черный
 
-        # Создаем текст кнопки - просто число
-        button_text = str(day)
-
-        # Если есть задачи, добавляем индикатор
+        # Текст ячейки - число и индикатор, если есть задачи (галочка - все выполнены)
+        indicator = ""
         if task_count > 0:
-            button_text += "\n•"
-
-        # Создаем кнопку
-        day_button = Button(
-            text=button_text,
-            size_hint_y=None,
-            height=dp(60),
-            background_color=bg_color,
-            background_normal='',
-            color=text_color,
-            font_size='18sp',
-            bold=True,
-            halign='center',
-            valign='middle'
-        )
-
-        # Обработчик нажатия
-        if on_press_callback:
-            day_button.bind(on_press=lambda instance: on_press_callback(day))
-
-        return day_button
+            indicator = "\n✓" if completed_count == task_count else "\n•"
+        self.day = day
+        self.text = str(day) + indicator
+        self.background_color = bg_color
+        self.color = text_color
 
 
 class CalendarScreen(Screen):
     """Упрощенный экран календаря с гарантированным отображением цифр"""
 
+    # 6 недель по 7 дней вмещают любой месяц
+    DAY_CELLS = 42
+
     current_month = StringProperty("")
     current_year = StringProperty("")
     calendar_grid = ObjectProperty(None)
@@ -71,74 +92,158 @@ class CalendarScreen(Screen):
     selected_date = ObjectProperty(None)
     selected_day_info_text = StringProperty("Выберите день для просмотра задач")
 
-    def __init__(self, task_service=None, **kwargs):
+    def __init__(self, task_service=None, async_service=None, calendar_service=None, **kwargs):
         super().__init__(**kwargs)
         self.task_service = task_service
+        self.async_service = async_service or (AsyncTaskService(task_service) if task_service else None)
+        # Сводки месяцев кэшируются: переход к недавнему или соседнему месяцу не читает хранилище
+        self.calendar_service = calendar_service or (
+            CalendarService(task_service) if task_service else None)
         self.current_date = datetime.now().replace(day=1)  # Начинаем с первого дня месяца
         self.selected_day = datetime.now().day
         self.selected_date = datetime.now()
         self.tasks_for_selected_day = []
+        self.month_summary = MonthSummary(0, 0)  # копия сводки показанного месяца
+        self._loaded_month = None  # (год, месяц), сводка которого лежит в month_summary
+        self._needs_redraw = False
+        self._day_cells = []  # пул ячеек сетки, создается при первом построении
+        if task_service:
+            # События приходят из потока, изменившего данные: обрабатываем в главном
+            task_service.events.subscribe(
+                lambda events: Clock.schedule_once(lambda dt: self._apply_changes(events), 0))
         Clock.schedule_once(self._update_calendar, 0.1)
 
     def on_enter(self, *args):
         """Вызывается при входе на экран"""
-        print("CalendarScreen: Вход на экран")
-        self._update_calendar()
+        logger.debug("Вход на экран")
+        if self._loaded_month != (self.current_date.year, self.current_date.month):
+            self._update_calendar()
+        elif self._needs_redraw:
+            self._build_calendar()
+        else:
+            logger.debug("Задачи месяца не менялись, календарь не перестраивается")
+
+    def _apply_changes(self, events):
+        """Применяет изменения задач к загруженному месяцу без перечитывания хранилища"""
+        if self._loaded_month is None:
+            return
+
+        def in_month(task):
+            return (task.due_date.year, task.due_date.month) == self._loaded_month
+
+        changed = False
+        for event in events:
+            for old in (event.previous, event.task):
+                if old is not None and in_month(old):
+                    changed |= self.month_summary.remove_task(event.task.id, old.due_date.day)
+            if event.type != ChangeType.DELETED and in_month(event.task):
+                self.month_summary.add_task(event.task)
+                changed = True
+
+        if changed:
+            self._needs_redraw = True
+            # Если календарь сейчас на экране, перерисовываем сразу
+            if self.manager and self.manager.current == self.name:
+                self._build_calendar()
 
     def _go_to_main(self):
         self.manager.current = 'main'
 
     def _update_calendar(self, dt=None):
-        """Обновляет отображение календаря."""
+        """Запрашивает задачи месяца в фоне; сетка строится, когда они загрузятся."""
         if not self.calendar_grid:
-            print("CalendarScreen: calendar_grid не найден")
+            logger.warning("calendar_grid не найден")
             return
 
-        self.calendar_grid.clear_widgets()
-
         # Устанавливаем заголовок месяца и года
         self.current_month = self._get_month_name(self.current_date.month)
         self.current_year = str(self.current_date.year)
 
-        # Получаем первый день месяца и количество дней
-        first_day = self.current_date.replace(day=1)
-        days_in_month = self._get_days_in_month(self.current_date.year, self.current_date.month)
+        year, month = self.current_date.year, self.current_date.month
+        if not self.async_service or not self.calendar_service:
+            self.month_summary = MonthSummary(year, month)
+            self._build_calendar()
+            return
+
+        # Месяц в кэше (недавний или заранее посчитанный соседний) показываем сразу
+        summary = self.calendar_service.peek(year, month)
+        if summary is not None:
+            self._on_month_loaded(year, month, summary)
+            return
 
-        # Добавляем пустые ячейки до первого дня месяца
-        first_weekday = first_day.weekday()  # 0-6, где 0 - понедельник
-        for _ in range(first_weekday):
-            from kivy.uix.widget import Widget
-            self.calendar_grid.add_widget(Widget(size_hint_y=None, height=dp(60)))
+        self.selected_day_info_text = "Загрузка задач..."
+        self.async_service.submit(
+            self.calendar_service.get_month, year, month,
+            on_result=lambda loaded: self._on_month_loaded(year, month, loaded),
+            on_error=lambda e: self._on_month_loaded(year, month, None, e))
 
-        # Добавляем дни месяца
+    def _on_month_loaded(self, year, month, summary, error=None):
+        """Показывает сводку месяца и заранее считает соседние месяцы"""
+        # Пока шла загрузка, пользователь мог перейти к другому месяцу
+        if (year, month) != (self.current_date.year, self.current_date.month):
+            return
+        if error is not None:
+            logger.error("Ошибка загрузки задач: %s", error)
+            summary = MonthSummary(year, month)
+
+        # Экран меняет свою сводку по событиям, поэтому берет копию, а не объект из кэша
+        self.month_summary = summary.copy()
+        self._loaded_month = (year, month) if error is None else None
+        self._build_calendar()
+        if error is None:
+            self._prefetch_adjacent(year, month)
+
+    def _prefetch_adjacent(self, year, month):
+        """Считает в фоне предыдущий и следующий месяцы, чтобы переход к ним был мгновенным"""
+        for delta in (-1, 1):
+            adjacent = self._shift_month(year, month, delta)
+            if not self.calendar_service.is_cached(*adjacent):
+                self.async_service.submit(
+                    self.calendar_service.get_month, *adjacent,
+                    on_error=lambda e: logger.warning("Ошибка подготовки соседнего месяца: %s", e))
+
+    def _ensure_day_cells(self):
+        """Один раз создает пул ячеек сетки"""
+        if self._day_cells:
+            return
+        self.calendar_grid.clear_widgets()
+        for _ in range(self.DAY_CELLS):
+            cell = CalendarDayButton(self._on_day_selected)
+            self._day_cells.append(cell)
+            self.calendar_grid.add_widget(cell)
+
+    def _first_weekday(self):
+        """Ячейка первого дня месяца: 0-6, где 0 - понедельник"""
+        return self.current_date.replace(day=1).weekday()
+
+    def _show_day(self, day):
+        """Обновляет ячейку дня текущего месяца"""
+        index = self._first_weekday() + day - 1
         today = datetime.now()
-        for day in range(1, days_in_month + 1):
-            is_today = (day == today.day and
-                        self.current_date.month == today.month and
-                        self.current_date.year == today.year)
-            is_selected = (day == self.selected_day and
-                           self.current_date.month == today.month and
-                           self.current_date.year == today.year)
-            is_weekend = (first_weekday + day - 1) % 7 >= 5  # Суббота и воскресенье
-
-            # Получаем задачи для этого дня
-            day_date = datetime(self.current_date.year, self.current_date.month, day)
-            day_tasks = []
-            if self.task_service:
-                try:
-                    day_tasks = self.task_service.get_tasks_by_date(day_date)
-                except Exception as e:
-                    print(f"CalendarScreen: Ошибка загрузки задач: {e}")
-
-            day_widget = CalendarDayButton.create(
-                day=day,
-                is_today=is_today,
-                is_selected=is_selected,
-                is_weekend=is_weekend,
-                task_count=len(day_tasks),
-                on_press_callback=self._on_day_selected
-            )
-            self.calendar_grid.add_widget(day_widget)
+        is_current_month = (self.current_date.month == today.month and
+                            self.current_date.year == today.year)
+        self._day_cells[index].show_day(
+            day=day,
+            is_today=is_current_month and day == today.day,
+            is_selected=day == self.selected_day,
+            is_weekend=index % 7 >= 5,  # Суббота и воскресенье
+            task_count=self.month_summary.task_count(day),
+            completed_count=self.month_summary.completed_count(day)
+        )
+
+    def _build_calendar(self):
+        """Заполняет сетку дней по уже загруженным задачам месяца (без создания виджетов)"""
+        self._needs_redraw = False
+        self._ensure_day_cells()
+
+        first_weekday = self._first_weekday()
+        days_in_month = self._get_days_in_month(self.current_date.year, self.current_date.month)
+        for index, cell in enumerate(self._day_cells):
+            day = index - first_weekday + 1
+            if 1 <= day <= days_in_month:
+                self._show_day(day)
+            else:
+                cell.show_blank()
 
         # Обновляем информацию о выбранном дне
         self._update_selected_day_info()
@@ -149,15 +254,8 @@ class CalendarScreen(Screen):
             self.selected_day_info_text = "Выберите день для просмотра задач"
             return
 
-        # Получаем задачи для выбранного дня
-        selected_date = datetime(self.current_date.year, self.current_date.month, self.selected_day)
-        self.tasks_for_selected_day = []
-
-        if self.task_service:
-            try:
-                self.tasks_for_selected_day = self.task_service.get_tasks_by_date(selected_date)
-            except Exception as e:
-                print(f"CalendarScreen: Ошибка загрузки задач: {e}")
+        # Берем задачи выбранного дня из уже загруженного месяца
+        self.tasks_for_selected_day = self.month_summary.tasks_by_day.get(self.selected_day, [])
 
         # Обновляем текст информации
         if self.tasks_for_selected_day:
@@ -184,10 +282,15 @@ class CalendarScreen(Screen):
 
     def _on_day_selected(self, day):
         """Обрабатывает выбор дня."""
+        previous_day = self.selected_day
         self.selected_day = day
         self.selected_date = datetime(self.current_date.year, self.current_date.month, day)
-        print(f"CalendarScreen: Выбран день {day}")
-        self._update_calendar()
+        logger.debug("Выбран день %s", day)
+        # Задачи месяца уже загружены: меняются только ячейки старого и нового дня
+        if previous_day:
+            self._show_day(previous_day)
+        self._show_day(day)
+        self._update_selected_day_info()
 
     def _get_month_name(self, month_num):
         """Возвращает название месяца по номеру"""
@@ -207,44 +310,40 @@ class CalendarScreen(Screen):
         last_day = next_month - timedelta(days=1)
         return last_day.day
 
+    @staticmethod
+    def _shift_month(year, month, delta):
+        """(год, месяц), отстоящий от заданного на delta месяцев"""
+        index = year * 12 + month - 1 + delta
+        return index // 12, index % 12 + 1
+
     def _prev_month(self):
         """Переход к предыдущему месяцу."""
         try:
-            if self.current_date.month == 1:
-                new_year = self.current_date.year - 1
-                new_month = 12
-            else:
-                new_year = self.current_date.year
-                new_month = self.current_date.month - 1
+            new_year, new_month = self._shift_month(self.current_date.year, self.current_date.month, -1)
 
             self.current_date = datetime(new_year, new_month, 1)
             self.selected_day = 0
-            print(f"CalendarScreen: Переход к {new_month}/{new_year}")
+            logger.debug("Переход к %s/%s", new_month, new_year)
             self._update_calendar()
         except Exception as e:
-            print(f"CalendarScreen: Ошибка перехода к предыдущему месяцу: {e}")
+            logger.error("Ошибка перехода к предыдущему месяцу: %s", e)
 
     def _next_month(self):
         """Переход к следующему месяцу."""
         try:
-            if self.current_date.month == 12:
-                new_year = self.current_date.year + 1
-                new_month = 1
-            else:
-                new_year = self.current_date.year
-                new_month = self.current_date.month + 1
+            new_year, new_month = self._shift_month(self.current_date.year, self.current_date.month, 1)
 
             self.current_date = datetime(new_year, new_month, 1)
             self.selected_day = 0
-            print(f"CalendarScreen: Переход к {new_month}/{new_year}")
+            logger.debug("Переход к %s/%s", new_month, new_year)
             self._update_calendar()
         except Exception as e:
-            print(f"CalendarScreen: Ошибка перехода к следующему месяцу: {e}")
+            logger.error("Ошибка перехода к следующему месяцу: %s", e)
 
     def _go_to_today(self):
         """Переход к текущему дню."""
         today = datetime.now()
         self.current_date = today.replace(day=1)
         self.selected_day = today.day
-        print("CalendarScreen: Переход к сегодняшнему дню")
+        logger.debug("Переход к сегодняшнему дню")
         self._update_calendar()
\ No newline at end of file
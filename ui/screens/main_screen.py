@@ -3,67 +3,142 @@ from kivy.lang import Builder
 from kivy.properties import ObjectProperty
 from kivy.clock import Clock
 from kivy.metrics import dp
+from datetime import datetime
+from core.events import ChangeType
+from core.models import TaskStatus
 import os
 
+# Список задач на карточках; импортируется до KV-файла, который его использует
+from ui.widgets.task_list import TaskList
+from services.async_task_service import AsyncTaskService
+
 # Загружаем KV-файлы
 kv_path = os.path.join(os.path.dirname(__file__), '..', 'kv', 'main_screen.kv')
 Builder.load_file(kv_path)
+from utils.metrics import get_logger
 
-# Импортируем нашу современную карточку задачи
-from ui.widgets.task_card import TaskCard
+logger = get_logger(__name__)
 
 
 class MainScreen(Screen):
     """Главный экран в современном стиле"""
 
-    tasks_container = ObjectProperty(None)
+    task_list = ObjectProperty(None)
+    state_container = ObjectProperty(None)
+
+    # Состояние загрузки показывается, только если задачи не пришли за это время
+    LOADING_DELAY = 0.2
 
-    def __init__(self, task_service=None, **kwargs):
+    def __init__(self, task_service=None, async_service=None, **kwargs):
         super().__init__(**kwargs)
         self.task_service = task_service
+        self.async_service = async_service or (AsyncTaskService(task_service) if task_service else None)
+        self._loading_event = None
+        self._request_pending = False
+        # Изменения задач применяются к списку по id; перечитывать его нужно только
+        # после ошибки загрузки или смены дня
+        self._dirty = True
+        self._loaded_date = None
+        # Задачи, выполнение которых запрошено с этого экрана: их карточки убирает _complete_task
+        self._completing = set()
+        if task_service:
+            task_service.events.subscribe(self._on_tasks_changed)
         Clock.schedule_once(self._load_tasks, 0.1)
 
+    def _on_tasks_changed(self, events):
+        """Передает изменения сегодняшних задач в главный поток"""
+        today = datetime.now().date()
+        relevant = [event for event in events if today in event.affected_dates()]
+        if relevant:
+            Clock.schedule_once(lambda dt: self._apply_changes(relevant), 0)
+
+    def _apply_changes(self, events):
+        """Добавляет, обновляет или убирает карточки измененных задач"""
+        today = datetime.now().date()
+        if self._loaded_date != today:
+            return
+
+        for event in events:
+            task = event.task
+            if task.id in self._completing:
+                continue
+            if (event.type != ChangeType.DELETED and task.due_date.date() == today
+                    and task.status != TaskStatus.COMPLETED):
+                self.task_list.upsert_task(task)
+            else:
+                self.task_list.remove_task(task.id)
+        self._sync_empty_state()
+
+    def _sync_empty_state(self):
+        """Показывает пустое состояние, когда в списке не осталось задач, и убирает его"""
+        if self._request_pending:
+            return
+        if self.task_list.data:
+            self.state_container.clear_widgets()
+        else:
+            self._show_empty_state()
+
     def _load_tasks(self, dt=None):
         """Загружает задачи при входе на экран"""
-        print("MainScreen: Загрузка задач...")
-        if self.task_service and self.tasks_container:
+        logger.debug("Загрузка задач...")
+        if self.async_service and self.task_list:
             self._update_tasks_display()
 
     def _update_tasks_display(self):
-        """Обновляет отображение задач"""
-        if not self.tasks_container:
-            print("MainScreen: tasks_container не найден")
+        """Запрашивает задачи на сегодня в фоне; список обновится в _show_tasks"""
+        if not self.task_list:
+            logger.warning("task_list не найден")
             return
 
-        self.tasks_container.clear_widgets()
+        # Сбрасываем до запроса: изменение во время загрузки снова пометит список
+        self._dirty = False
+        self._loaded_date = datetime.now().date()
+        self._request_pending = True
+        if self._loading_event is None:
+            self._loading_event = Clock.schedule_once(
+                lambda dt: self._show_loading_state(), self.LOADING_DELAY)
+        self.async_service.get_today_tasks(on_result=self._show_tasks,
+                                           on_error=self._on_load_error)
+
+    def _cancel_loading(self):
+        """Отменяет показ состояния загрузки"""
+        if self._loading_event is not None:
+            self._loading_event.cancel()
+            self._loading_event = None
+
+    def _on_load_error(self, error):
+        """Показывает ошибку фоновой загрузки"""
+        self._cancel_loading()
+        self._request_pending = False
+        self._dirty = True
+        logger.error("Ошибка загрузки задач: %s", error)
+        self._show_error_state()
+
+    def _show_tasks(self, today_tasks):
+        """Отображает загруженные задачи"""
+        self._cancel_loading()
+        self._request_pending = False
+        self.state_container.clear_widgets()
 
         try:
-            today_tasks = self.task_service.get_today_tasks()
-
             if not today_tasks:
                 self._show_empty_state()
                 return
 
-            # Добавляем отступ сверху
-            from kivy.uix.widget import Widget
-            self.tasks_container.add_widget(Widget(size_hint_y=None, height=dp(8)))
-
-            for task in today_tasks:
-                task_widget = TaskCard(task, self._complete_task)
-                self.tasks_container.add_widget(task_widget)
-
-                # Добавляем маленький разделитель между задачами
-                separator = Widget(size_hint_y=None, height=dp(8))
-                self.tasks_container.add_widget(separator)
-
-            print(f"MainScreen: Отображено {len(today_tasks)} задач")
+            # Карточки создаются RecycleView только для видимых строк
+            self.task_list.set_tasks(today_tasks)
+            logger.debug("Отображено %d задач", len(today_tasks))
 
         except Exception as e:
-            print(f"MainScreen: Ошибка загрузки задач: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Ошибка загрузки задач: %s", e)
             self._show_error_state()
 
+    def _show_state(self, widget):
+        """Показывает состояние экрана вместо списка задач"""
+        self.task_list.clear()
+        self.state_container.clear_widgets()
+        self.state_container.add_widget(widget)
+
     def _show_empty_state(self):
         """Показывает красивое состояние при отсутствии задач"""
         from kivy.uix.boxlayout import BoxLayout
@@ -88,8 +163,21 @@ class MainScreen(Screen):
         )
 
         empty_container.add_widget(empty_label)
-        self.tasks_container.add_widget(empty_container)
-        print("MainScreen: Нет задач на сегодня")
+        self._show_state(empty_container)
+        logger.debug("Нет задач на сегодня")
+
+    def _show_loading_state(self):
+        """Показывает состояние загрузки, пока задачи читаются с диска"""
+        from kivy.uix.label import Label
+
+        self._loading_event = None
+        self._show_state(Label(
+            text="Загрузка задач...",
+            font_size='16sp',
+            color=(0.6, 0.6, 0.6, 1),
+            size_hint_y=None,
+            height=dp(180)
+        ))
 
     def _show_error_state(self):
         """Показывает состояние ошибки"""
@@ -115,22 +203,36 @@ class MainScreen(Screen):
         )
 
         error_container.add_widget(error_label)
-        self.tasks_container.add_widget(error_container)
+        self._show_state(error_container)
 
     def _complete_task(self, task_id):
-        """Отмечает задачу как выполненную"""
-        try:
-            self.task_service.complete_task(task_id)
-            # Обновляем отображение после небольшой задержки
-            Clock.schedule_once(lambda dt: self._update_tasks_display(), 0.5)
-            print(f"Задача {task_id} отмечена как выполненная")
-        except Exception as e:
-            print(f"Ошибка выполнения задачи: {e}")
+        """Отмечает задачу как выполненную и убирает ее карточку без перечитывания списка"""
+        if task_id in self._completing:
+            return
+        self._completing.add(task_id)
+        # Галочка появляется сразу, карточка исчезает, когда сервис подтвердит выполнение
+        self.task_list.update_row(task_id, is_completed=True)
+
+        def on_completed(task):
+            self._completing.discard(task_id)
+            # None - задачу уже удалили: карточка убирается так же
+            self.task_list.remove_task(task_id, animate=True, on_removed=self._sync_empty_state)
+            logger.debug("Задача %s отмечена как выполненная", task_id)
+
+        def on_error(error):
+            self._completing.discard(task_id)
+            self.task_list.update_row(task_id, is_completed=False)
+            logger.error("Ошибка выполнения задачи: %s", error)
+
+        self.async_service.complete_task(task_id, on_result=on_completed, on_error=on_error)
 
     def on_enter(self, *args):
         """Обновляет задачи при входе на экран"""
-        print("MainScreen: Вход на экран")
-        Clock.schedule_once(self._load_tasks, 0.1)
+        logger.debug("Вход на экран")
+        if self._dirty or self._loaded_date != datetime.now().date():
+            Clock.schedule_once(self._load_tasks, 0.1)
+        else:
+            logger.debug("Список актуален, задачи не перечитываются")
 
     def _go_to_task_editor(self, instance=None):
         self.manager.current = 'task_editor'
@@ -1,50 +1,75 @@
 from kivy.uix.screenmanager import Screen
 from kivy.lang import Builder
-from kivy.properties import NumericProperty, ListProperty
-from datetime import datetime, timedelta
+from kivy.properties import NumericProperty, ListProperty, BooleanProperty
+from services.async_task_service import AsyncTaskService
+from services.analytics_service import AnalyticsService
+from utils.metrics import get_logger
 import os
 
 kv_path = os.path.join(os.path.dirname(__file__), '..', 'kv', 'statistics_screen.kv')
 Builder.load_file(kv_path)
 
+logger = get_logger(__name__)
+
 
 class StatisticsScreen(Screen):
     """Экран статистики продуктивности."""
 
+    CHART_DAYS = 30
+
     completed_tasks = NumericProperty(0)
     productivity_percent = NumericProperty(0)
-    chart_data = ListProperty([])
+    chart_data = ListProperty([])  # точки ProductivitySeries.to_chart_data() за CHART_DAYS дней
+    current_streak = NumericProperty(0)
+    longest_streak = NumericProperty(0)
+    is_loading = BooleanProperty(False)
 
-    def __init__(self, task_service=None, **kwargs):
+    def __init__(self, task_service=None, async_service=None, analytics_service=None, **kwargs):
         super().__init__(**kwargs)
         self.task_service = task_service
+        self.async_service = async_service or (AsyncTaskService(task_service) if task_service else None)
+        # Итоги поддерживаются AnalyticsService по событиям, загружать задачи не нужно
+        self.analytics_service = analytics_service or (
+            AnalyticsService(task_service) if task_service else None)
+        self.total_tasks = 0
 
     def on_enter(self, *args):
         """Обновляет статистику при входе на экран"""
         self._update_statistics()
 
     def _update_statistics(self):
-        """Обновляет статистические данные"""
-        if not self.task_service:
+        """Запрашивает итоги в фоне (первый раз они могут строиться по всем задачам)"""
+        if not self.async_service or not self.analytics_service:
             return
 
-        try:
-            # Получаем все задачи
-            all_tasks = self.task_service.get_all_tasks()
+        # Построенные итоги приходят мгновенно - загрузку показываем только при перестройке
+        self.is_loading = not self.analytics_service.is_built
+        self.async_service.submit(self.analytics_service.get_summary,
+                                  on_result=self._apply_statistics,
+                                  on_error=self._on_load_error)
+        self.async_service.submit(self.analytics_service.get_productivity_series, self.CHART_DAYS,
+                                  on_result=self._apply_series,
+                                  on_error=self._on_load_error)
 
-            # Считаем выполненные задачи
-            completed_tasks = [task for task in all_tasks if task.status.value == "Выполнена"]
-            self.completed_tasks = len(completed_tasks)
+    def _on_load_error(self, error):
+        self.is_loading = False
+        logger.error("Ошибка загрузки статистики: %s", error)
 
-            # Считаем продуктивность (процент выполненных от всех задач)
-            total_tasks = len(all_tasks)
-            if total_tasks > 0:
-                self.productivity_percent = int((self.completed_tasks / total_tasks) * 100)
-            else:
-                self.productivity_percent = 0
+    def _apply_statistics(self, summary):
+        """Обновляет статистические данные"""
+        self.is_loading = False
+        self.total_tasks = summary['total_tasks']
+        self.completed_tasks = summary['completed_tasks']
+        self.productivity_percent = summary['productivity_percent']
 
-        except Exception as e:
-            print(f"Ошибка загрузки статистики: {e}")
+    def _apply_series(self, series):
+        """Передает ряды продуктивности в данные графика (None - NumPy не установлен)"""
+        if series is None:
+            self.chart_data = []
+            return
+        self.chart_data = series.to_chart_data()
+        self.current_streak = series.current_streak
+        self.longest_streak = series.longest_streak
 
     def _go_to_main(self):
         self.manager.current = 'main'
\ No newline at end of file
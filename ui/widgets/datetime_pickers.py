@@ -0,0 +1,273 @@
+from datetime import datetime
+from calendar import monthrange
+from kivy.uix.modalview import ModalView
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.properties import NumericProperty
+from kivy.metrics import dp
+
+MONTH_NAMES = [
+    "Январь", "Февраль", "Март", "Апрель", "Май", "Июнь",
+    "Июль", "Август", "Сентябрь", "Октябрь", "Ноябрь", "Декабрь"
+]
+
+# Цвета кнопок: (фон, текст)
+_SELECTED = ((0.2, 0.6, 1, 1), (1, 1, 1, 1))
+_TODAY = ((0.9, 0.95, 1, 1), (0.2, 0.6, 1, 1))
+_DAY = ((1, 1, 1, 1), (0.1, 0.1, 0.1, 1))
+_BLANK = ((0, 0, 0, 0), (0, 0, 0, 0))
+_TIME = ((0.95, 0.95, 0.95, 1), (0.3, 0.3, 0.3, 1))
+
+
+def _paint(button, colors, bold=None):
+    button.background_color, button.color = colors
+    if bold is not None:
+        button.bold = bold
+
+
+class PickerButton(Button):
+    """Кнопка окна выбора со значением (день, час или минута); 0 у пустого дня"""
+
+    value = NumericProperty(0)
+
+
+class DatePickerView(ModalView):
+    """Окно выбора даты: виджеты создаются один раз, при открытии и смене месяца
+    меняются только подписи и цвета 42 ячеек (6 недель по 7 дней)"""
+
+    DAY_CELLS = 42
+
+    def __init__(self, on_date_selected, **kwargs):
+        super().__init__(
+            size_hint=(0.85, 0.7),
+            background_color=(0, 0, 0, 0.3),
+            overlay_color=(0, 0, 0, 0.5),
+            **kwargs
+        )
+        self._on_selected = on_date_selected
+        self.date = datetime.now()  # дата, выбранная в окне (при смене месяца - его первый день)
+        self._cells = []
+
+        main_layout = BoxLayout(orientation='vertical', spacing=dp(0), padding=dp(0))
+
+        # Заголовок
+        header_layout = BoxLayout(size_hint_y=0.15, padding=[dp(20), dp(10)], spacing=dp(10))
+        header_layout.add_widget(Label(
+            text='Выберите дату',
+            font_size='20sp',
+            bold=True,
+            color=(0.1, 0.15, 0.25, 1)
+        ))
+        main_layout.add_widget(header_layout)
+
+        # Навигация по месяцам
+        nav_layout = BoxLayout(size_hint_y=0.1, padding=[dp(20), dp(5)], spacing=dp(10))
+        prev_btn = Button(
+            text='←',
+            font_size='18sp',
+            background_color=(0.9, 0.9, 0.9, 1),
+            background_normal='',
+            color=(0.3, 0.3, 0.3, 1)
+        )
+        self.month_label = Label(font_size='16sp', bold=True, color=(0.1, 0.15, 0.25, 1))
+        next_btn = Button(
+            text='→',
+            font_size='18sp',
+            background_color=(0.9, 0.9, 0.9, 1),
+            background_normal='',
+            color=(0.3, 0.3, 0.3, 1)
+        )
+        prev_btn.bind(on_press=lambda instance: self.change_month(-1))
+        next_btn.bind(on_press=lambda instance: self.change_month(1))
+        nav_layout.add_widget(prev_btn)
+        nav_layout.add_widget(self.month_label)
+        nav_layout.add_widget(next_btn)
+        main_layout.add_widget(nav_layout)
+
+        # Дни недели
+        days_header = GridLayout(cols=7, size_hint_y=0.08, spacing=dp(2))
+        for day in ['ПН', 'ВТ', 'СР', 'ЧТ', 'ПТ', 'СБ', 'ВС']:
+            days_header.add_widget(Label(text=day, font_size='12sp', bold=True, color=(0.4, 0.4, 0.4, 1)))
+        main_layout.add_widget(days_header)
+
+        # Сетка календаря: постоянный пул ячеек
+        calendar_grid = GridLayout(cols=7, spacing=dp(2), padding=dp(15), size_hint_y=0.67)
+        for _ in range(self.DAY_CELLS):
+            cell = PickerButton(background_normal='')
+            cell.bind(on_press=self._on_day_pressed)
+            self._cells.append(cell)
+            calendar_grid.add_widget(cell)
+        main_layout.add_widget(calendar_grid)
+
+        # Кнопки действий
+        actions_layout = BoxLayout(size_hint_y=0.1, padding=[dp(20), dp(10)], spacing=dp(10))
+        today_btn = Button(
+            text='Сегодня',
+            background_color=(0.9, 0.9, 0.9, 1),
+            background_normal='',
+            color=(0.3, 0.3, 0.3, 1)
+        )
+        confirm_btn = Button(
+            text='Выбрать',
+            background_color=(0.2, 0.6, 1, 1),
+            background_normal='',
+            color=(1, 1, 1, 1)
+        )
+        today_btn.bind(on_press=lambda instance: self._select(datetime.now()))
+        confirm_btn.bind(on_press=lambda instance: self._select(self.date))
+        actions_layout.add_widget(today_btn)
+        actions_layout.add_widget(confirm_btn)
+        main_layout.add_widget(actions_layout)
+
+        self.add_widget(main_layout)
+
+    def open_for(self, date: datetime):
+        """Показывает окно с выбранной датой date"""
+        self.date = date
+        self._refresh()
+        self.open()
+
+    def change_month(self, delta: int):
+        """Переходит на delta месяцев; выбранной становится первое число месяца"""
+        index = self.date.year * 12 + self.date.month - 1 + delta
+        self.date = self.date.replace(year=index // 12, month=index % 12 + 1, day=1)
+        self._refresh()
+
+    def _refresh(self):
+        """Обновляет заголовок месяца и ячейки дней"""
+        year, month = self.date.year, self.date.month
+        self.month_label.text = f"{MONTH_NAMES[month - 1]} {year}"
+        first_weekday, days_in_month = monthrange(year, month)
+        today = datetime.now().date()
+        is_current_month = (today.year, today.month) == (year, month)
+
+        for index, cell in enumerate(self._cells):
+            day = index - first_weekday + 1
+            if not 1 <= day <= days_in_month:
+                cell.value = 0
+                cell.text = ""
+                _paint(cell, _BLANK)
+                continue
+            cell.value = day
+            cell.text = str(day)
+            if day == self.date.day:
+                _paint(cell, _SELECTED, bold=True)
+            elif is_current_month and day == today.day:
+                _paint(cell, _TODAY, bold=True)
+            else:
+                _paint(cell, _DAY, bold=False)
+
+    def _on_day_pressed(self, cell):
+        if cell.value:
+            self._select(self.date.replace(day=cell.value))
+
+    def _select(self, date: datetime):
+        self.dismiss()
+        self._on_selected(date)
+
+
+class TimePickerView(ModalView):
+    """Окно выбора времени: 24 кнопки часов и 12 кнопок минут создаются один раз,
+    выбор меняет цвета только старой и новой кнопки"""
+
+    MINUTE_STEP = 5
+
+    def __init__(self, on_time_selected, **kwargs):
+        super().__init__(
+            size_hint=(0.8, 0.6),
+            background_color=(0, 0, 0, 0.3),
+            overlay_color=(0, 0, 0, 0.5),
+            **kwargs
+        )
+        self._on_selected = on_time_selected
+        self.hour = 12
+        self.minute = 0
+        self._hour_buttons = {}
+        self._minute_buttons = {}
+
+        main_layout = BoxLayout(orientation='vertical', spacing=dp(0), padding=dp(20))
+
+        # Заголовок
+        main_layout.add_widget(Label(
+            text='Выберите время',
+            font_size='20sp',
+            bold=True,
+            size_hint_y=0.2,
+            color=(0.1, 0.15, 0.25, 1)
+        ))
+
+        # Сетка часов и минут
+        time_layout = BoxLayout(orientation='vertical', spacing=dp(10), size_hint_y=0.6)
+
+        time_layout.add_widget(Label(text='Часы:', size_hint_y=0.1, color=(0.4, 0.4, 0.4, 1)))
+        hours_grid = GridLayout(cols=6, spacing=dp(5), size_hint_y=0.4)
+        for hour in range(0, 24):
+            hours_grid.add_widget(self._make_button(hour, self._hour_buttons, self._on_hour_pressed))
+        time_layout.add_widget(hours_grid)
+
+        time_layout.add_widget(Label(text='Минуты:', size_hint_y=0.1, color=(0.4, 0.4, 0.4, 1)))
+        minutes_grid = GridLayout(cols=6, spacing=dp(5), size_hint_y=0.4)
+        for minute in range(0, 60, self.MINUTE_STEP):
+            minutes_grid.add_widget(self._make_button(minute, self._minute_buttons, self._on_minute_pressed))
+        time_layout.add_widget(minutes_grid)
+
+        main_layout.add_widget(time_layout)
+
+        # Кнопки
+        buttons_layout = BoxLayout(spacing=dp(10), size_hint_y=0.2)
+        cancel_btn = Button(
+            text='Отмена',
+            background_color=(0.9, 0.9, 0.9, 1),
+            background_normal='',
+            color=(0.3, 0.3, 0.3, 1)
+        )
+        ok_btn = Button(
+            text='OK',
+            background_color=(0.2, 0.6, 1, 1),
+            background_normal='',
+            color=(1, 1, 1, 1)
+        )
+        cancel_btn.bind(on_press=lambda instance: self.dismiss())
+        ok_btn.bind(on_press=self._on_ok)
+        buttons_layout.add_widget(cancel_btn)
+        buttons_layout.add_widget(ok_btn)
+        main_layout.add_widget(buttons_layout)
+
+        self.add_widget(main_layout)
+
+    @staticmethod
+    def _make_button(value, buttons, on_press):
+        button = PickerButton(value=value, text=str(value).zfill(2), background_normal='')
+        _paint(button, _TIME)
+        button.bind(on_press=on_press)
+        buttons[value] = button
+        return button
+
+    @staticmethod
+    def _move_selection(buttons, old, new):
+        """Снимает выделение со старой кнопки и выделяет новую"""
+        if old in buttons:
+            _paint(buttons[old], _TIME)
+        if new in buttons:
+            _paint(buttons[new], _SELECTED)
+
+    def open_for(self, hour: int, minute: int):
+        """Показывает окно с выбранным временем"""
+        self._move_selection(self._hour_buttons, self.hour, hour)
+        self._move_selection(self._minute_buttons, self.minute, minute)
+        self.hour, self.minute = hour, minute
+        self.open()
+
+    def _on_hour_pressed(self, button):
+        self._move_selection(self._hour_buttons, self.hour, button.value)
+        self.hour = button.value
+
+    def _on_minute_pressed(self, button):
+        self._move_selection(self._minute_buttons, self.minute, button.value)
+        self.minute = button.value
+
+    def _on_ok(self, instance):
+        self.dismiss()
+        self._on_selected(self.hour, self.minute)
@@ -1,7 +1,10 @@
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.animation import Animation
 from kivy.properties import StringProperty, ListProperty, BooleanProperty
 from kivy.metrics import dp
 from kivy.lang import Builder
+from utils.date_utils import format_date_display, format_time_display
 import os
 
 # Загружаем KV-файл для карточки задачи
@@ -10,9 +13,28 @@ if os.path.exists(kv_path):
     Builder.load_file(kv_path)
 
 
-class TaskCard(BoxLayout):
-    """Современная карточка задачи в стиле Todoist/Notion"""
+def task_card_data(task) -> dict:
+    """Данные строки TaskList для задачи: карточка заполняется из них при переиспользовании"""
+    return {
+        'task_id': task.id,
+        'title': task.title,
+        'description': task.description or "",
+        'date_text': format_date_display(task.due_date),
+        'time_text': format_time_display(task.due_date),
+        'priority': task.priority.value,
+        'is_completed': task.status.value == "Выполнена",
+        'height': dp(85) if task.description else dp(70),
+    }
 
+
+class TaskCard(RecycleDataViewBehavior, BoxLayout):
+    """Современная карточка задачи в стиле Todoist/Notion.
+
+    Представление строки TaskList: RecycleView переиспользует карточки при прокрутке,
+    поэтому все содержимое задается свойствами из task_card_data().
+    """
+
+    task_id = StringProperty("")
     title = StringProperty("")
     description = StringProperty("")
     date_text = StringProperty("")
@@ -21,22 +43,20 @@ class TaskCard(BoxLayout):
     priority_color = ListProperty([0.5, 0.5, 0.5, 1])
     is_completed = BooleanProperty(False)
 
-    def __init__(self, task, on_complete_callback, **kwargs):
+    def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.task = task
-        self.on_complete_callback = on_complete_callback
-
-        # Устанавливаем свойства
-        self.title = task.title
-        self.description = task.description if task.description else ""
-        self.is_completed = task.status.value == "Выполнена"
+        self.task_list = None
+        self._set_priority_colors()
 
-        from utils.date_utils import format_date_display, format_time_display
-        self.date_text = format_date_display(task.due_date)
-        self.time_text = format_time_display(task.due_date)
-        self.priority = task.priority.value
+    def refresh_view_attrs(self, rv, index, data):
+        """Заполняет переиспользуемую карточку данными строки"""
+        self.task_list = rv
+        # Карточка могла остаться прозрачной (или исчезать) после анимации удаления другой строки
+        Animation.cancel_all(self, 'opacity')
+        self.opacity = 1
+        super().refresh_view_attrs(rv, index, data)
 
-        # Устанавливаем цвета в зависимости от приоритета
+    def on_priority(self, instance, value):
         self._set_priority_colors()
 
     def _set_priority_colors(self):
@@ -51,5 +71,5 @@ class TaskCard(BoxLayout):
 
     def toggle_completion(self):
         """Переключает состояние выполнения задачи"""
-        if not self.is_completed and self.on_complete_callback:
-            self.on_complete_callback(self.task.id)
\ No newline at end of file
+        if not self.is_completed and self.task_list and self.task_list.complete_callback:
+            self.task_list.complete_callback(self.task_id)
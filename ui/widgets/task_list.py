@@ -0,0 +1,80 @@
+from typing import Callable, Optional
+from kivy.uix.recycleview import RecycleView
+from kivy.animation import Animation
+from kivy.clock import Clock
+from kivy.properties import ObjectProperty
+from kivy.lang import Builder
+import os
+
+# Карточка должна быть зарегистрирована до загрузки KV-правила с viewclass
+from ui.widgets.task_card import TaskCard, task_card_data
+
+kv_path = os.path.join(os.path.dirname(__file__), '..', 'kv', 'task_list.kv')
+Builder.load_file(kv_path)
+
+
+class TaskList(RecycleView):
+    """Виртуализированный список задач: создаются только карточки видимых строк.
+
+    Строки - словари task_card_data(), поэтому день с тысячами задач не создает
+    тысячи виджетов. Изменения применяются по id задачи: меняется только строка
+    этой задачи, остальные карточки не пересоздаются.
+    """
+
+    complete_callback = ObjectProperty(None, allownone=True)  # вызывается с id задачи
+
+    REMOVE_DURATION = 0.3
+
+    def set_tasks(self, tasks):
+        """Показывает список задач"""
+        self.data = [task_card_data(task) for task in tasks]
+
+    def clear(self):
+        self.data = []
+
+    def _index_of(self, task_id: str) -> Optional[int]:
+        for index, row in enumerate(self.data):
+            if row['task_id'] == task_id:
+                return index
+        return None
+
+    def upsert_task(self, task):
+        """Обновляет строку задачи (если она изменилась) или добавляет ее в конец"""
+        row = task_card_data(task)
+        index = self._index_of(task.id)
+        if index is None:
+            self.data.append(row)
+        elif self.data[index] != row:
+            self.data[index] = row
+
+    def update_row(self, task_id: str, **values):
+        """Меняет отдельные поля строки задачи"""
+        index = self._index_of(task_id)
+        if index is not None:
+            self.data[index] = dict(self.data[index], **values)
+
+    def remove_task(self, task_id: str, animate: bool = False,
+                    on_removed: Optional[Callable[[], None]] = None):
+        """Удаляет строку задачи; видимая карточка при animate сначала плавно исчезает.
+
+        on_removed вызывается после удаления, даже если строки уже не было.
+        """
+        index = self._index_of(task_id)
+        view = self.view_adapter.get_visible_view(index) if animate and index is not None else None
+        if view is None:
+            self._finish_removal(task_id, on_removed)
+            return
+
+        # Строка удаляется по таймеру, а не по концу анимации: карточка при переиспользовании
+        # отменяет анимацию (TaskCard.refresh_view_attrs), и on_complete тогда не приходит
+        Animation(opacity=0, duration=self.REMOVE_DURATION).start(view)
+        Clock.schedule_once(lambda dt: self._finish_removal(task_id, on_removed),
+                            self.REMOVE_DURATION)
+
+    def _finish_removal(self, task_id: str, on_removed: Optional[Callable[[], None]]):
+        # За время анимации строка могла сместиться или уже удалиться
+        index = self._index_of(task_id)
+        if index is not None:
+            self.data.pop(index)
+        if on_removed:
+            on_removed()
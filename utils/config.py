@@ -4,9 +4,45 @@ import os
 DATA_DIR = os.path.join(os.path.expanduser("~"), ".smart_planner")
 TASKS_FILE = os.path.join(DATA_DIR, "tasks.json")
 STATISTICS_FILE = os.path.join(DATA_DIR, "statistics.json")
+TASKS_DB_FILE = os.path.join(DATA_DIR, "tasks.db")
+REMINDERS_FILE = os.path.join(DATA_DIR, "reminders.json")
+
+# Хранилище задач: "json", "journal" или "sqlite" ("json" сначала сжимает оставшийся журнал в снимок)
+STORAGE_BACKEND = "journal"
+
+# Задержка записи задач на диск: изменения за это время объединяются в одну запись
+SAVE_DEBOUNCE_SECONDS = 0.5
+
+# Сериализатор файлов задач: "auto" (orjson если установлен), "orjson" или "json"
+SERIALIZER = "auto"
+
+# Настройки журнала задач
+JOURNAL_COMPACT_BYTES = 1024 * 1024  # Сжимать журнал после 1 МБ
+JOURNAL_COMPACT_RATIO = 1.0  # ... или когда операций больше, чем задач
+JOURNAL_COMPACT_MIN_OPS = 100
+
+# Скетчи квантилей времени выполнения и опоздания: относительная погрешность p50/p90/p99
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Календарь: сколько последних месяцев держать в кэше сводок
+CALENDAR_CACHE_MONTHS = 12
+
+# Логирование и метрики
+LOG_LEVEL = "INFO"  # "DEBUG" выводит и построчные списки задач
+METRICS_ENABLED = True  # Таймеры и гистограммы задержек методов сервиса и репозиториев
+
+# Профилирование (cProfile + tracemalloc): SMART_PLANNER_PROFILE=1 или True здесь
+PROFILING_ENABLED = os.environ.get("SMART_PLANNER_PROFILE", "") not in ("", "0")
+PROFILE_DIR = os.path.join(DATA_DIR, "profiles")
+PROFILE_TOP_ALLOCATIONS = 25
 
 # Настройки уведомлений
 REMINDER_BEFORE_MINUTES = 30
+NOTIFICATION_WORKERS = 2  # Потоки, показывающие уведомления
+NOTIFICATION_QUEUE_SIZE = 100  # При переполнении очереди уведомления отбрасываются
+NOTIFICATION_COALESCE_SECONDS = 60  # Напоминания одного окна объединяются в одно уведомление
+NOTIFICATION_RATE_PER_MINUTE = 10
+NOTIFICATION_RATE_BURST = 3
 
 # Цвета приоритетов
 PRIORITY_COLORS = {
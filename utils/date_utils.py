@@ -31,4 +31,14 @@ def format_time_display(date: datetime) -> str:
 
 def is_date_in_future(date: datetime) -> bool:
     """Проверяет, что дата в будущем"""
-    return date > datetime.now()
\ No newline at end of file
+    return date > datetime.now()
+
+
+def month_bounds(year: int, month: int):
+    """Возвращает (начало месяца, начало следующего месяца)"""
+    start = datetime(year, month, 1)
+    if month == 12:
+        end = datetime(year + 1, 1, 1)
+    else:
+        end = datetime(year, month + 1, 1)
+    return start, end
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""Логирование и метрики: таймеры, счетчики вызовов и гистограммы задержек."""
+import functools
+import inspect
+import logging
+import math
+import threading
+import time
+from typing import Dict, Iterable
+from utils.config import LOG_LEVEL, METRICS_ENABLED
+
+LOGGER_NAME = "smart_planner"
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Возвращает логгер приложения для модуля или экрана"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def setup_logging(level: str = LOG_LEVEL):
+    """Настраивает вывод логов приложения (вызывается один раз при запуске)"""
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+
+
+class LatencyHistogram:
+    """Гистограмма задержек с геометрическими корзинами (шаг ~9%, от 1 мкс).
+
+    Запись под блокировкой только добавляет значение в буфер, а в корзины буфер
+    раскладывается пачками. Память ограничена числом корзин и размером буфера;
+    перцентили приблизительные, максимум и сумма точные.
+    """
+
+    GROWTH = 2 ** 0.125
+    MIN_SECONDS = 1e-6
+    BUFFER_SIZE = 4096
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._samples = []
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        # Без блокировки значение, добавленное во время замены буфера в _fold, теряется
+        with self._lock:
+            self._samples.append(seconds)
+            if len(self._samples) >= self.BUFFER_SIZE:
+                self._fold_locked()
+
+    def _fold(self):
+        """Раскладывает накопленные значения по корзинам"""
+        with self._lock:
+            self._fold_locked()
+
+    def _fold_locked(self):
+        samples, self._samples = self._samples, []
+        buckets = self.buckets
+        for seconds in samples:
+            index = (0 if seconds <= self.MIN_SECONDS
+                     else math.ceil(math.log(seconds / self.MIN_SECONDS) / self._LOG_GROWTH))
+            buckets[index] = buckets.get(index, 0) + 1
+        if samples:
+            self._count += len(samples)
+            self._total += sum(samples)
+            self._max = max(self._max, max(samples))
+
+    @property
+    def count(self) -> int:
+        self._fold()
+        return self._count
+
+    @property
+    def total(self) -> float:
+        self._fold()
+        return self._total
+
+    @property
+    def max(self) -> float:
+        self._fold()
+        return self._max
+
+    def percentile(self, fraction: float) -> float:
+        """Верхняя граница корзины, в которую попадает перцентиль (в секундах)"""
+        self._fold()
+        with self._lock:
+            if not self._count:
+                return 0.0
+            rank = fraction * self._count
+            seen = 0
+            for index in sorted(self.buckets):
+                seen += self.buckets[index]
+                if seen >= rank:
+                    return min(self.MIN_SECONDS * self.GROWTH ** index, self._max)
+            return self._max
+
+
+class Metrics:
+    """Реестр метрик: гистограммы задержек по операциям и счетчики событий"""
+
+    def __init__(self):
+        self.timers: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def timer(self, name: str) -> LatencyHistogram:
+        histogram = self.timers.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.timers.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+
+    def snapshot(self) -> dict:
+        """Снимок метрик: для каждой операции count, p50/p95/max и сумма в миллисекундах"""
+        timers = {}
+        for name, histogram in sorted(self.timers.items()):
+            if not histogram.count:
+                continue
+            timers[name] = {
+                'count': histogram.count,
+                'p50_ms': histogram.percentile(0.5) * 1000,
+                'p95_ms': histogram.percentile(0.95) * 1000,
+                'max_ms': histogram.max * 1000,
+                'total_ms': histogram.total * 1000,
+            }
+        with self._lock:
+            counters = dict(sorted(self.counters.items()))
+        return {'timers': timers, 'counters': counters}
+
+    def format_snapshot(self) -> str:
+        """Снимок метрик в виде текстовой таблицы"""
+        snapshot = self.snapshot()
+        lines = [f"{'операция':<48} {'вызовов':>8} {'p50 мс':>9} {'p95 мс':>9} {'max мс':>9}"]
+        for name, timer in snapshot['timers'].items():
+            lines.append(f"{name:<48} {timer['count']:>8} {timer['p50_ms']:>9.3f} "
+                         f"{timer['p95_ms']:>9.3f} {timer['max_ms']:>9.3f}")
+        for name, value in snapshot['counters'].items():
+            lines.append(f"{name:<48} {value:>8}")
+        return "\n".join(lines)
+
+
+metrics = Metrics()
+
+
+def timed(name: str):
+    """Декоратор: записывает время каждого вызова в гистограмму name"""
+    def decorator(func):
+        histogram = metrics.timer(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.record(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def instrumented(extra_methods: Iterable[str] = ()):
+    """Декоратор класса: оборачивает таймером его публичные методы и extra_methods.
+
+    Метрики называются "Класс.метод", поэтому переопределенный метод наследника и
+    вызванный из него метод родителя учитываются отдельно.
+    """
+    def decorator(cls):
+        if not METRICS_ENABLED:
+            return cls
+        for attr, value in list(vars(cls).items()):
+            if not callable(value) or isinstance(value, (staticmethod, classmethod, type)):
+                continue
+            if attr.startswith('_') and attr not in extra_methods:
+                continue
+            # Для контекстных менеджеров (transaction) измерялось бы только создание
+            if inspect.isgeneratorfunction(getattr(value, '__wrapped__', None)):
+                continue
+            setattr(cls, attr, timed(f"{cls.__name__}.{attr}")(value))
+        return cls
+    return decorator
@@ -0,0 +1,178 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from core.models import Task
+from utils.config import (NOTIFICATION_COALESCE_SECONDS, NOTIFICATION_QUEUE_SIZE,
+                          NOTIFICATION_RATE_BURST, NOTIFICATION_RATE_PER_MINUTE,
+                          NOTIFICATION_WORKERS)
+from utils.metrics import get_logger, metrics
+
+logger = get_logger(__name__)
+
+
+class PlyerNotifier:
+    """Показывает системные уведомления через plyer"""
+
+    def notify(self, title: str, message: str, timeout: int = 10):
+        # Импорт здесь: plyer нужен только при реальном показе уведомления
+        from plyer import notification
+        notification.notify(title=title, message=message, timeout=timeout)
+
+
+class RateLimiter:
+    """Ограничитель частоты (token bucket): rate токенов в секунду, не больше burst подряд"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Ждет, пока не появится свободный токен"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class PendingNotification:
+    """Уведомление в очереди: задачи одного окна времени"""
+
+    __slots__ = ('window', 'tasks', 'fire_time', 'queued_at')
+
+    def __init__(self, window: int, tasks: List[Task], fire_time: datetime):
+        self.window = window
+        self.tasks = tasks
+        self.fire_time = fire_time
+        self.queued_at = time.monotonic()
+
+    def title_and_message(self):
+        """Текст уведомления: одна задача или сводка по окну"""
+        if len(self.tasks) == 1:
+            task = self.tasks[0]
+            return (f"Напоминание: {task.title}",
+                    f"Срок выполнения: {task.due_date.strftime('%H:%M')}")
+        due_time = min(task.due_date for task in self.tasks).strftime('%H:%M')
+        titles = ", ".join(task.title for task in self.tasks[:3])
+        if len(self.tasks) > 3:
+            titles += ", ..."
+        return f"Задач к {due_time}: {len(self.tasks)}", titles
+
+
+class NotificationDispatcher:
+    """Доставляет уведомления вне потока планировщика.
+
+    Задачи, срабатывающие в одном окне времени, объединяются в одно уведомление
+    (в том числе с еще не отправленным уведомлением того же окна). Очередь ограничена:
+    при переполнении уведомление отбрасывается и учитывается в счетчике dropped.
+    on_delivered вызывается со списком id задач только после успешного показа, поэтому
+    отброшенные, не показанные из-за ошибки и не дождавшиеся очереди напоминания
+    остаются неотправленными.
+    """
+
+    def __init__(self, notifier=None, workers: int = NOTIFICATION_WORKERS,
+                 queue_size: int = NOTIFICATION_QUEUE_SIZE,
+                 coalesce_seconds: int = NOTIFICATION_COALESCE_SECONDS,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self.notifier = notifier or PlyerNotifier()
+        self.coalesce_seconds = coalesce_seconds
+        self.rate_limiter = rate_limiter or RateLimiter(
+            NOTIFICATION_RATE_PER_MINUTE / 60, NOTIFICATION_RATE_BURST)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pending: Dict[int, PendingNotification] = {}  # окно -> уведомление в очереди
+        self._lock = threading.Lock()
+        self._counters = {'submitted': 0, 'coalesced': 0, 'delivered': 0, 'dropped': 0, 'failed': 0}
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        # Вызывается из потока доставки со списком id задач показанного уведомления
+        self.on_delivered = None
+        self._workers = [
+            threading.Thread(target=self._run, name=f"notification-worker-{number}", daemon=True)
+            for number in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _window_of(self, fire_time: datetime) -> int:
+        return int(fire_time.timestamp()) // self.coalesce_seconds
+
+    def submit(self, tasks: Iterable[Task], fire_time: datetime) -> List[str]:
+        """Ставит задачи, сработавшие в fire_time, в очередь доставки.
+
+        Возвращает id принятых задач; отброшенных из-за переполнения очереди среди них нет.
+        """
+        window = self._window_of(fire_time)
+        accepted = []
+        with self._lock:
+            for task in tasks:
+                self._counters['submitted'] += 1
+                pending = self._pending.get(window)
+                if pending is not None:
+                    pending.tasks.append(task)
+                    self._counters['coalesced'] += 1
+                    accepted.append(task.id)
+                    continue
+
+                pending = PendingNotification(window, [task], fire_time)
+                try:
+                    self._queue.put_nowait(pending)
+                except queue.Full:
+                    self._counters['dropped'] += 1
+                    continue
+                self._pending[window] = pending
+                accepted.append(task.id)
+        return accepted
+
+    def _run(self):
+        while True:
+            pending = self._queue.get()
+            self.rate_limiter.acquire()
+            # После извлечения к уведомлению больше нельзя добавлять задачи
+            with self._lock:
+                if self._pending.get(pending.window) is pending:
+                    del self._pending[pending.window]
+                title, message = pending.title_and_message()
+                task_ids = [task.id for task in pending.tasks]
+
+            try:
+                self.notifier.notify(title=title, message=message, timeout=10)
+            except Exception as e:
+                logger.error("Ошибка показа уведомления: %s", e)
+                with self._lock:
+                    self._counters['failed'] += 1
+                continue
+
+            # Пропущенные при закрытом приложении напоминания не должны портить задержку,
+            # поэтому она считается от постановки в очередь
+            latency = time.monotonic() - pending.queued_at
+            with self._lock:
+                self._counters['delivered'] += 1
+                self._latency_total += latency
+                self._latency_max = max(self._latency_max, latency)
+            metrics.timer("NotificationDispatcher.delivery_latency").record(latency)
+
+            if self.on_delivered is not None:
+                try:
+                    self.on_delivered(task_ids)
+                except Exception as e:
+                    logger.error("Ошибка сохранения показанных напоминаний: %s", e)
+
+    def stats(self) -> dict:
+        """Счетчики доставки и задержка от постановки в очередь до показа (в секундах)"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['queued'] = self._queue.qsize()
+            stats['latency_avg'] = (self._latency_total / stats['delivered']
+                                    if stats['delivered'] else 0.0)
+            stats['latency_max'] = self._latency_max
+        return stats
@@ -0,0 +1,159 @@
+"""Профилирование по запросу: cProfile и tracemalloc вокруг экранов и сервисов.
+
+Включается переменной окружения SMART_PLANNER_PROFILE=1 (или PROFILING_ENABLED в config).
+Отчеты сессии пишутся в PROFILE_DIR/<время запуска>/: .pstats-файл на каждую операцию,
+summary.txt с временем и пиком памяти и allocations.txt с топом мест выделения памяти.
+"""
+import cProfile
+import functools
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from utils.config import PROFILE_DIR, PROFILE_TOP_ALLOCATIONS, PROFILING_ENABLED
+from utils.metrics import get_logger
+
+logger = get_logger(__name__)
+
+
+class OperationProfile:
+    """Накопленные данные одной операции"""
+
+    __slots__ = ('stats', 'calls', 'total_seconds', 'max_seconds', 'peak_bytes')
+
+    def __init__(self):
+        self.stats: Optional[pstats.Stats] = None
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.peak_bytes = 0
+
+
+class ProfilingSession:
+    """Сессия профилирования от запуска до закрытия приложения.
+
+    cProfile работает в потоке, где он включен, поэтому профилируется только внешний
+    вызов в каждом потоке: вложенные обернутые методы попадают в профиль внешнего.
+    Одновременно активен один профайлер (в Python 3.12+ иначе нельзя): параллельный
+    вызов из другого потока учитывается только по времени и памяти.
+    """
+
+    def __init__(self, directory: str = None, top_allocations: int = PROFILE_TOP_ALLOCATIONS):
+        self.directory = directory or os.path.join(
+            PROFILE_DIR, datetime.now().strftime("%Y%m%d-%H%M%S"))
+        self.top_allocations = top_allocations
+        self.operations: Dict[str, OperationProfile] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._profiler_lock = threading.Lock()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    def wrap(self, name: str, func):
+        """Оборачивает функцию профилированием под именем name"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(self._local, 'active', False):
+                return func(*args, **kwargs)
+
+            self._local.active = True
+            profiler = cProfile.Profile() if self._profiler_lock.acquire(blocking=False) else None
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            if profiler is not None:
+                profiler.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                    self._profiler_lock.release()
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1] - start_memory
+                self._local.active = False
+                self._record(name, profiler, elapsed, peak)
+        return wrapper
+
+    def _record(self, name: str, profiler: Optional[cProfile.Profile], elapsed: float, peak: int):
+        with self._lock:
+            operation = self.operations.setdefault(name, OperationProfile())
+            if profiler is not None:
+                if operation.stats is None:
+                    operation.stats = pstats.Stats(profiler)
+                else:
+                    operation.stats.add(profiler)
+            operation.calls += 1
+            operation.total_seconds += elapsed
+            operation.max_seconds = max(operation.max_seconds, elapsed)
+            operation.peak_bytes = max(operation.peak_bytes, peak)
+
+    def profile_methods(self, cls, names: Iterable[str] = None):
+        """Оборачивает методы класса (по умолчанию - все публичные, объявленные в нем)"""
+        if names is None:
+            names = [name for name, value in vars(cls).items()
+                     if callable(value) and not name.startswith('_')
+                     and not isinstance(value, (staticmethod, classmethod, type))]
+        for name in names:
+            if name in vars(cls):
+                setattr(cls, name, self.wrap(f"{cls.__name__}.{name}", vars(cls)[name]))
+
+    def write_reports(self):
+        """Записывает отчеты сессии в каталог профилей"""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            operations = sorted(self.operations.items(),
+                                key=lambda item: item[1].total_seconds, reverse=True)
+            lines = [f"{'операция':<48} {'вызовов':>8} {'всего мс':>10} {'max мс':>9} {'пик КБ':>9}"]
+            for name, operation in operations:
+                if operation.stats is not None:
+                    operation.stats.dump_stats(os.path.join(self.directory, f"{name}.pstats"))
+                lines.append(f"{name:<48} {operation.calls:>8} {operation.total_seconds * 1000:>10.1f} "
+                             f"{operation.max_seconds * 1000:>9.1f} {operation.peak_bytes / 1024:>9.1f}")
+
+        with open(os.path.join(self.directory, "summary.txt"), 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        with open(os.path.join(self.directory, "allocations.txt"), 'w', encoding='utf-8') as f:
+            for statistic in snapshot.statistics('lineno')[:self.top_allocations]:
+                f.write(f"{statistic}\n")
+
+        logger.info("Отчеты профилирования записаны в %s", self.directory)
+
+
+def start_profiling() -> Optional[ProfilingSession]:
+    """Включает профилирование экранов, TaskService и загрузки/записи задач.
+
+    Возвращает сессию или None, если профилирование выключено. Вызывается до создания
+    сервисов и экранов, так как оборачивает методы классов.
+    """
+    if not PROFILING_ENABLED:
+        return None
+
+    # Импорт здесь: модули экранов при импорте загружают KV-файлы
+    from services.task_service import TaskService
+    from repository.task_repository import TaskRepository
+    from repository.journal_task_repository import JournalTaskRepository
+    from ui.screens.main_screen import MainScreen
+    from ui.screens.task_editor import TaskEditorScreen
+    from ui.screens.calendar_view import CalendarScreen
+    from ui.screens.statistics_screen import StatisticsScreen
+
+    session = ProfilingSession()
+    session.profile_methods(TaskService)
+    session.profile_methods(TaskRepository, ['_load_tasks', '_save_tasks'])
+    session.profile_methods(JournalTaskRepository, ['_load_tasks'])
+    for screen_class in (MainScreen, TaskEditorScreen, CalendarScreen, StatisticsScreen):
+        # on_enter объявлен у экрана или унаследован от Screen - оборачиваем в обоих случаях
+        if 'on_enter' not in vars(screen_class):
+            setattr(screen_class, 'on_enter', screen_class.on_enter)
+        session.profile_methods(screen_class, ['on_enter'])
+    logger.info("Профилирование включено, отчеты: %s", session.directory)
+    return session